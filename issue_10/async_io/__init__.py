@@ -2,12 +2,18 @@
 Package for asynchronous file I/O utilities.
 """
 
-from .async_file_reader import AsyncFileReader, async_open
-from .async_file_writer import AsyncFileWriter, async_write_open
+from .async_file_reader import AsyncFileReader, DEFAULT_CHUNK_SIZE, async_open
+from .async_file_writer import AsyncFileWriter, BufferedAsyncFileWriter, ParallelGzipWriter, async_write_open
+from .compression import codec_for_path, open_file
 
 __all__ = [
     'AsyncFileReader',
     'AsyncFileWriter',
+    'BufferedAsyncFileWriter',
+    'DEFAULT_CHUNK_SIZE',
+    'ParallelGzipWriter',
     'async_open',
-    'async_write_open'
+    'async_write_open',
+    'codec_for_path',
+    'open_file'
 ]
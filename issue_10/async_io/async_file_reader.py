@@ -3,29 +3,61 @@ Asynchronous file I/O utilities for reading files.
 """
 
 import asyncio
-from typing import Optional
+import io
+from typing import List, Optional, Union
+
+from .compression import open_file
+
+# Default block size for chunked reading: large enough that the executor
+# round trip is negligible next to the read itself
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def _split_lines(block: Union[str, bytes]) -> List[Union[str, bytes]]:
+    """Split a block into lines on '\n' only, keeping the line endings, like readline()."""
+    if isinstance(block, str):
+        return io.StringIO(block, newline='\n').readlines()
+    return io.BytesIO(block).readlines()
 
 
 class AsyncFileReader:
     """A file-like object wrapper for asynchronous reading."""
     
-    def __init__(self, file_path: str, mode: str):
+    def __init__(self, file_path: str, mode: str, chunk_size: Optional[int] = None,
+                 compression: Optional[str] = None):
         """
         Initialize with a file path and mode.
         
         Args:
             file_path: Path to the file
             mode: File open mode ('r', 'w', etc.)
+            chunk_size: If given, read the file in blocks of about this many
+                characters (bytes in binary mode) with one executor call each,
+                and serve lines from memory. Otherwise every line is read
+                with its own executor call.
+            compression: None to read the file as is, 'auto' to decompress
+                by file extension (.gz, .bz2, .xz), or a codec name ('gzip',
+                'bz2', 'lzma'). Decompression runs in the executor along
+                with the read.
         """
         self.file_path = file_path
         self.mode = mode
+        self.chunk_size = chunk_size
+        self.compression = compression
         self.file = None
+        self._newline = b'\n' if 'b' in mode else '\n'
+        self._lines: List[Union[str, bytes]] = []
+        self._line_index = 0
+        # Reused buffer for read_view(), and the partial line left in it
+        self._view_buffer: Optional[bytearray] = None
+        self._carry_start = 0
+        self._carry_end = 0
         
     async def __aenter__(self):
         """Async context manager entry."""
         # Open the file in the specified mode
         loop = asyncio.get_event_loop()
-        self.file = await loop.run_in_executor(None, lambda: open(self.file_path, self.mode))
+        self.file = await loop.run_in_executor(None, open_file, self.file_path, self.mode, self.compression)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -43,10 +75,143 @@ class AsyncFileReader:
         if not self.file:
             raise ValueError("File is not open")
         
+        if self.chunk_size:
+            if self._line_index >= len(self._lines):
+                self._lines = await self.read_lines()
+                self._line_index = 0
+                if not self._lines:
+                    return self._newline[:0]
+            line = self._lines[self._line_index]
+            self._line_index += 1
+            return line
+        
         loop = asyncio.get_event_loop()
         line = await loop.run_in_executor(None, self.file.readline)
         return line
     
+    def _read_block_sync(self) -> Union[str, bytes]:
+        """Read about chunk_size of data, extended to the end of the line it stops in."""
+        data = self.file.read(self.chunk_size or DEFAULT_CHUNK_SIZE)
+        if data and not data.endswith(self._newline):
+            data += self.file.readline()
+        return data
+    
+    async def read_block(self) -> Union[str, bytes]:
+        """
+        Read the next block of whole lines with a single executor call.
+        
+        Lines already buffered by readline() or iteration are returned first.
+        
+        Returns:
+            A block of complete lines, or an empty string at end of file
+        """
+        if not self.file:
+            raise ValueError("File is not open")
+        
+        if self._line_index < len(self._lines):
+            buffered = self._newline[:0].join(self._lines[self._line_index:])
+            self._lines = []
+            self._line_index = 0
+            return buffered
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._read_block_sync)
+    
+    def _read_view_sync(self) -> memoryview:
+        """Fill the reused buffer and return a view of the whole lines in it."""
+        buffer = self._view_buffer
+        if buffer is None:
+            buffer = self._view_buffer = bytearray(self.chunk_size or DEFAULT_CHUNK_SIZE)
+        
+        # Move the partial line left over from the previous block to the front
+        filled = self._carry_end - self._carry_start
+        if filled:
+            buffer[:filled] = buffer[self._carry_start:self._carry_end]
+        self._carry_start = self._carry_end = 0
+        
+        while True:
+            if filled == len(buffer):
+                # A single line is longer than the buffer, so grow it
+                grown = bytearray(2 * len(buffer))
+                grown[:filled] = buffer
+                buffer = self._view_buffer = grown
+            read = self.file.readinto(memoryview(buffer)[filled:])
+            if not read:
+                # End of file: whatever is left is the last, unterminated line
+                return memoryview(buffer)[:filled]
+            start = filled
+            filled += read
+            end = buffer.rfind(b'\n', start, filled) + 1
+            if end:
+                self._carry_start, self._carry_end = end, filled
+                return memoryview(buffer)[:end]
+    
+    async def read_view(self) -> memoryview:
+        """
+        Read the next block of whole lines into a reused buffer, binary mode only.
+        
+        Unlike read_block(), no new bytes object is allocated per block: the
+        returned view points into a buffer owned by the reader, and is only
+        valid until the next call. Copy it (e.g. with bytes()) to keep it.
+        Don't mix it with read_block() or line reads on the same reader.
+        
+        Returns:
+            A view of a block of complete lines, empty at end of file
+        """
+        if not self.file:
+            raise ValueError("File is not open")
+        if 'b' not in self.mode:
+            raise ValueError("read_view() requires a binary mode")
+        
+        if self._line_index < len(self._lines):
+            return memoryview(await self.read_block())
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._read_view_sync)
+    
+    async def tell(self) -> int:
+        """
+        Return the position of the next unread data, for a later seek().
+        
+        In text mode this is an opaque number, like io.TextIOBase.tell().
+        
+        Returns:
+            The current position
+        """
+        if not self.file:
+            raise ValueError("File is not open")
+        if self._line_index < len(self._lines):
+            raise ValueError("tell() is not available while lines read ahead are buffered")
+        
+        loop = asyncio.get_event_loop()
+        position = await loop.run_in_executor(None, self.file.tell)
+        return position - (self._carry_end - self._carry_start)
+    
+    async def seek(self, position: int) -> None:
+        """
+        Move to a position returned by tell(), discarding anything read ahead.
+        
+        Args:
+            position: The position to continue reading from
+        """
+        if not self.file:
+            raise ValueError("File is not open")
+        
+        self._lines = []
+        self._line_index = 0
+        self._carry_start = self._carry_end = 0
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.file.seek, position)
+    
+    async def read_lines(self) -> List[Union[str, bytes]]:
+        """
+        Read the next block of whole lines and split it into lines.
+        
+        Returns:
+            A list of lines with their line endings, empty at end of file
+        """
+        return _split_lines(await self.read_block())
+    
     def __aiter__(self):
         """Return self as an async iterator."""
         return self
@@ -67,17 +232,20 @@ class AsyncFileReader:
         return line
 
 
-async def async_open(file_path: str, mode: str) -> AsyncFileReader:
+async def async_open(file_path: str, mode: str, chunk_size: Optional[int] = None,
+                     compression: Optional[str] = None) -> AsyncFileReader:
     """
     Open a file asynchronously.
     
     Args:
         file_path: Path to the file
         mode: File open mode
+        chunk_size: Optional block size for chunked reading
+        compression: Optional codec, see AsyncFileReader
         
     Returns:
         An async file reader object
     """
-    reader = AsyncFileReader(file_path, mode)
+    reader = AsyncFileReader(file_path, mode, chunk_size, compression)
     await reader.__aenter__()
     return reader
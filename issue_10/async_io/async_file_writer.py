@@ -3,31 +3,49 @@ Asynchronous file I/O utilities for writing files.
 """
 
 import asyncio
-from typing import Optional
+import os
+from concurrent.futures import Executor
+from typing import IO, List, Optional, Set, Union
+
+from .compression import compress_member, open_file
+
+# Defaults for BufferedAsyncFileWriter
+DEFAULT_FLUSH_SIZE = 1024 * 1024
+DEFAULT_MAX_BUFFER = 8 * 1024 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
 
 
 class AsyncFileWriter:
     """A file-like object wrapper for asynchronous writing."""
     
-    def __init__(self, file_path: str, mode: str):
+    def __init__(self, file_path: str, mode: str, compression: Optional[str] = None):
         """
         Initialize with a file path and mode.
         
         Args:
             file_path: Path to the file
             mode: File open mode ('r', 'w', etc.)
+            compression: None to write the file as is, 'auto' to compress by
+                file extension (.gz, .bz2, .xz), or a codec name ('gzip',
+                'bz2', 'lzma'). Compression runs in the executor along with
+                the write.
         """
         self.file_path = file_path
         self.mode = mode
+        self.compression = compression
         self.file = None
         
     async def __aenter__(self):
         """Async context manager entry."""
         # Open the file in the specified mode
         loop = asyncio.get_event_loop()
-        self.file = await loop.run_in_executor(None, lambda: open(self.file_path, self.mode))
+        self.file = await loop.run_in_executor(None, self._open)
         return self
     
+    def _open(self) -> IO:
+        """Open the underlying file; runs in the executor."""
+        return open_file(self.file_path, self.mode, self.compression)
+    
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         if self.file:
@@ -35,12 +53,12 @@ class AsyncFileWriter:
             await self.flush()
             await asyncio.get_event_loop().run_in_executor(None, self.file.close)
     
-    async def write(self, data: str) -> int:
+    async def write(self, data: Union[str, bytes, memoryview]) -> int:
         """
         Write data to the file asynchronously.
         
         Args:
-            data: Data to write
+            data: Data to write; bytes or a memoryview in binary mode
             
         Returns:
             Number of bytes written
@@ -59,19 +77,258 @@ class AsyncFileWriter:
         
         loop = asyncio.get_event_loop()
         await loop.run_in_executor(None, self.file.flush)
+    
+    def _fsync(self) -> int:
+        """Flush Python's buffer, fsync and return the position; runs in the executor."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+    
+    async def sync(self) -> int:
+        """
+        Write out everything written so far and wait until it is on disk.
+        
+        Returns:
+            The file position, i.e. the size of the output that is now durable
+        """
+        await self.flush()
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._fsync)
+
+
+class BufferedAsyncFileWriter(AsyncFileWriter):
+    """
+    An asynchronous writer that coalesces small writes into large batches.
+    
+    Writes are collected in memory and handed to the executor as one joined
+    write once `flush_size` is buffered, or every `flush_interval` seconds if
+    anything is buffered. Batches are written in order, in the background.
+    Once `max_buffer` is buffered or being written, `write()` waits until a
+    batch has been written, so a fast producer cannot outrun the disk.
+    """
+    
+    def __init__(self, file_path: str, mode: str,
+                 flush_size: int = DEFAULT_FLUSH_SIZE,
+                 max_buffer: int = DEFAULT_MAX_BUFFER,
+                 flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+                 compression: Optional[str] = None):
+        """
+        Initialize with a file path, mode and buffering limits.
+        
+        Args:
+            file_path: Path to the file
+            mode: File open mode ('w', 'a', 'wb', etc.)
+            flush_size: Buffered size that triggers a background write
+            max_buffer: Buffered plus in-flight size at which write() blocks
+            flush_interval: Seconds between time-based flushes, or None to
+                only flush on size
+            compression: Optional codec, see AsyncFileWriter
+        """
+        super().__init__(file_path, mode, compression)
+        if flush_size > max_buffer:
+            raise ValueError("flush_size must not exceed max_buffer")
+        self.flush_size = flush_size
+        self.max_buffer = max_buffer
+        self.flush_interval = flush_interval
+        self._buffer: List[Union[str, bytes]] = []
+        self._buffered = 0  # Size of the data in _buffer
+        self._pending = 0  # Size of the data buffered or being written
+        self._write_lock = asyncio.Lock()
+        self._drained = asyncio.Condition()
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await super().__aenter__()
+        if self.flush_interval:
+            self._flush_timer = asyncio.create_task(self._flush_periodically())
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            try:
+                await self._flush_timer
+            except asyncio.CancelledError:
+                pass
+            self._flush_timer = None
+        if self.file:
+            try:
+                await self.flush()
+            finally:
+                await asyncio.get_event_loop().run_in_executor(None, self.file.close)
+    
+    async def write(self, data: Union[str, bytes, memoryview]) -> int:
+        """
+        Buffer data for writing, waiting first if the buffer limit is reached.
+        
+        Args:
+            data: Data to write. A memoryview is copied, since it may point
+                into a buffer the caller reuses before the flush runs.
+            
+        Returns:
+            Number of characters (bytes in binary mode) accepted
+        """
+        if not self.file:
+            raise ValueError("File is not open")
+        self._raise_if_failed()
+        
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        size = len(data)
+        if self._pending and self._pending + size > self.max_buffer:
+            if self._buffer:
+                self._start_flush()
+            async with self._drained:
+                await self._drained.wait_for(
+                    lambda: self._error is not None
+                    or not self._pending
+                    or self._pending + size <= self.max_buffer
+                )
+            self._raise_if_failed()
+        
+        self._buffer.append(data)
+        self._buffered += size
+        self._pending += size
+        if self._buffered >= self.flush_size:
+            self._start_flush()
+        return size
+    
+    async def flush(self) -> None:
+        """Write out everything buffered and flush the file buffer to disk."""
+        if not self.file:
+            raise ValueError("File is not open")
+        
+        if self._buffer:
+            self._start_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks)
+        self._raise_if_failed()
+        await super().flush()
+    
+    def _start_flush(self) -> None:
+        """Hand the current buffer to a background task that writes it."""
+        batch, size = self._buffer, self._buffered
+        self._buffer = []
+        self._buffered = 0
+        task = asyncio.create_task(self._write_batch(batch, size))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+    
+    async def _write_batch(self, batch: List[Union[str, bytes]], size: int) -> None:
+        """Write one batch in the executor, after every batch started before it."""
+        try:
+            # asyncio.Lock is FIFO, so batches reach the file in the order they were started
+            async with self._write_lock:
+                await self._write_out(batch)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._pending -= size
+            async with self._drained:
+                self._drained.notify_all()
+    
+    async def _write_out(self, batch: List[Union[str, bytes]]) -> None:
+        """Write one batch to the file; called in order, one batch at a time."""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._write_sync, batch)
+    
+    def _write_sync(self, batch: List[Union[str, bytes]]) -> None:
+        """Join a batch and write it to the file; runs in the executor."""
+        if len(batch) == 1:
+            # A single large write needs no join, and so no copy
+            self.file.write(batch[0])
+        else:
+            self.file.write(batch[0][:0].join(batch))
+    
+    async def _flush_periodically(self) -> None:
+        """Start a flush every flush_interval seconds if anything is buffered."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._buffer:
+                self._start_flush()
+    
+    def _raise_if_failed(self) -> None:
+        """Re-raise an error from a background write in the caller."""
+        if self._error is not None:
+            raise self._error
+
+
+
+class ParallelGzipWriter(BufferedAsyncFileWriter):
+    """
+    A buffered writer that compresses each batch as an independent gzip member.
+    
+    Every flush of `flush_size` is compressed on the executor as soon as it
+    is started, so up to max_buffer / flush_size batches compress in
+    parallel, while the members are still written in order. The result is a
+    standard multi-member gzip file that gzip.open() and zcat read as one
+    stream. zlib releases the GIL, so a thread pool is enough to scale.
+    """
+    
+    def __init__(self, file_path: str, mode: str,
+                 flush_size: int = DEFAULT_FLUSH_SIZE,
+                 max_buffer: int = DEFAULT_MAX_BUFFER,
+                 flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+                 executor: Optional[Executor] = None,
+                 compresslevel: int = 6,
+                 encoding: Optional[str] = None):
+        """
+        Initialize with a file path, mode, buffering limits and compression pool.
+        
+        Args:
+            file_path: Path to the file
+            mode: File open mode ('w', 'a', 'wb', 'ab'); in text mode writes
+                are encoded before compression
+            flush_size: Uncompressed size of each gzip member
+            max_buffer: Uncompressed size buffered or being compressed and
+                written at which write() blocks
+            flush_interval: Seconds between time-based flushes, or None to
+                only flush on size
+            executor: Pool to compress members on; defaults to the loop's
+                default executor
+            compresslevel: zlib compression level
+            encoding: Encoding for text mode; defaults to the locale's
+        """
+        super().__init__(file_path, mode, flush_size, max_buffer, flush_interval)
+        self.executor = executor
+        self.compresslevel = compresslevel
+        self.encoding = encoding
+    
+    def _open(self) -> IO:
+        """Open the file in binary mode, since members are written already compressed."""
+        return open(self.file_path, ('a' if 'a' in self.mode else 'w') + 'b')
+    
+    def _start_flush(self) -> None:
+        """Start compressing the current buffer, then queue the member for writing."""
+        loop = asyncio.get_event_loop()
+        member = loop.run_in_executor(self.executor, compress_member,
+                                      self._buffer, self.compresslevel, self.encoding)
+        self._buffer = [member]
+        super()._start_flush()
+    
+    async def _write_out(self, batch: List[asyncio.Future]) -> None:
+        """Wait for a batch's member to be compressed and write it."""
+        member = await batch[0]
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.file.write, member)
 
 
-async def async_write_open(file_path: str, mode: str) -> AsyncFileWriter:
+async def async_write_open(file_path: str, mode: str, compression: Optional[str] = None) -> AsyncFileWriter:
     """
     Open a file for writing asynchronously.
     
     Args:
         file_path: Path to the file
         mode: File open mode
+        compression: Optional codec, see AsyncFileWriter
         
     Returns:
         An async file writer object
     """
-    writer = AsyncFileWriter(file_path, mode)
+    writer = AsyncFileWriter(file_path, mode, compression)
     await writer.__aenter__()
     return writer
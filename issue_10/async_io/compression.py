@@ -0,0 +1,109 @@
+"""
+Compression codecs for the async readers and writers.
+
+Codecs are chosen by file extension. Compressed files are opened with the
+standard library's gzip, bz2 and lzma modules, which decompress and compress
+in whatever block size the caller reads or writes, so the chunked readers and
+buffered writers keep that work in large executor calls off the event loop.
+"""
+
+import bz2
+import gzip
+import locale
+import lzma
+import os
+from typing import IO, List, Optional, Union
+
+# Codec name -> module providing open()
+CODECS = {
+    'gzip': gzip,
+    'bz2': bz2,
+    'lzma': lzma,
+}
+
+# File extension -> codec name
+EXTENSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'lzma',
+    '.lzma': 'lzma',
+}
+
+
+def codec_for_path(file_path: str) -> Optional[str]:
+    """
+    Return the codec name for a file's extension, or None for a plain file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        'gzip', 'bz2', 'lzma' or None
+    """
+    return EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+
+def resolve_codec(file_path: str, compression: Optional[str]) -> Optional[str]:
+    """
+    Turn a compression argument into a codec name.
+
+    Args:
+        file_path: Path to the file, used when compression is 'auto'
+        compression: None for no compression, 'auto' to choose by extension,
+            or a codec name
+
+    Returns:
+        The codec name, or None for a plain file
+    """
+    if compression == 'auto':
+        return codec_for_path(file_path)
+    if compression is not None and compression not in CODECS:
+        raise ValueError(f"Unknown compression {compression!r}, expected None, 'auto' or one of {sorted(CODECS)}")
+    return compression
+
+
+def open_file(file_path: str, mode: str, compression: Optional[str] = None) -> IO:
+    """
+    Open a file, through a compression codec if one applies.
+
+    Modes mean the same as for open(): without 'b' the file is text, even
+    though the codec modules default to binary.
+
+    Args:
+        file_path: Path to the file
+        mode: File open mode ('r', 'w', 'rb', etc.)
+        compression: None, 'auto' or a codec name, see resolve_codec
+
+    Returns:
+        An open file object
+    """
+    codec = resolve_codec(file_path, compression)
+    if codec is None:
+        return open(file_path, mode)
+    if 'b' not in mode and 't' not in mode:
+        mode += 't'
+    return CODECS[codec].open(file_path, mode)
+
+
+def compress_member(batch: List[Union[str, bytes]], level: int = 6,
+                    encoding: Optional[str] = None) -> bytes:
+    """
+    Compress a batch of writes as one complete gzip member.
+
+    Concatenated gzip members form a valid gzip file, so members can be
+    compressed independently, on any number of workers, and written in order.
+    The member's timestamp is zero so the output is reproducible.
+
+    Args:
+        batch: Strings or bytes to join and compress
+        level: zlib compression level
+        encoding: Encoding for text batches; defaults to the locale's, like open()
+
+    Returns:
+        The gzip member
+    """
+    data = batch[0][:0].join(batch)
+    if isinstance(data, str):
+        data = data.encode(encoding or locale.getpreferredencoding(False))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
@@ -0,0 +1,3 @@
+"""
+Package for benchmarks of the async file pipeline.
+"""
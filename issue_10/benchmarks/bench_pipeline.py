@@ -0,0 +1,213 @@
+"""
+Benchmark AsyncFileReader, BufferedAsyncFileWriter and AsyncFileProcessor
+over a matrix of file counts, file sizes, line lengths and concurrency, and
+write the results as JSON so runs can be compared.
+
+Run from the issue_10 directory:
+
+    python -m benchmarks.bench_pipeline --file-sizes 10000000 --output run.json
+    python -m benchmarks.bench_pipeline --file-sizes 10000000 --compare run.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from async_io import AsyncFileReader, BufferedAsyncFileWriter, DEFAULT_CHUNK_SIZE
+from processing import AsyncFileProcessor
+from utils.file_utils import generate_corpus, generate_file
+
+# Bump when the meaning of a result field changes, so old files aren't compared blindly
+SCHEMA_VERSION = 1
+
+
+async def bench_reader(path: str) -> None:
+    """Read a file to the end in chunked blocks."""
+    async with AsyncFileReader(path, 'r', chunk_size=DEFAULT_CHUNK_SIZE) as reader:
+        while await reader.read_block():
+            pass
+
+
+async def bench_writer(path: str, size: int, line_length: int) -> None:
+    """Write size bytes of line_length lines, one write per line."""
+    line = "x" * (line_length - 1) + "\n"
+    async with BufferedAsyncFileWriter(path, 'w') as writer:
+        for _ in range(size // line_length):
+            await writer.write(line)
+
+
+async def bench_processor(input_dir: str, output_dir: str, max_concurrency: int) -> None:
+    """Process every file in input_dir with the default transform."""
+    processor = AsyncFileProcessor(input_dir, output_dir, max_concurrency=max_concurrency)
+    try:
+        files = sorted(os.path.join(input_dir, name) for name in os.listdir(input_dir))
+        results = await processor.process_files(files)
+        assert all(results.values()), results
+    finally:
+        processor.close()
+
+
+def measure(factory: Callable[[], Awaitable[None]], repeat: int) -> List[float]:
+    """
+    Run a benchmark coroutine repeat times, each in a fresh event loop.
+
+    Args:
+        factory: Returns a new coroutine for each run
+        repeat: Number of timed runs
+
+    Returns:
+        Elapsed seconds of each run
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(factory())
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(case: Dict[str, Any], timings: List[float], total_bytes: int, line_length: int) -> Dict[str, Any]:
+    """
+    Build one JSON result from a case and its timings.
+
+    Rates use the median run, which is less noisy than the mean.
+
+    Args:
+        case: Parameters identifying the case
+        timings: Elapsed seconds of each run
+        total_bytes: Bytes handled per run
+        line_length: Bytes per line
+
+    Returns:
+        The result dict
+    """
+    median = statistics.median(timings)
+    return {
+        **case,
+        'seconds': timings,
+        'median_seconds': median,
+        'min_seconds': min(timings),
+        'mb_per_second': total_bytes / median / 1e6,
+        'lines_per_second': total_bytes // line_length / median,
+    }
+
+
+def run(file_counts: List[int], file_sizes: List[int], line_lengths: List[int],
+        concurrencies: List[int], repeat: int, seed: int) -> Dict[str, Any]:
+    """
+    Run every benchmark case and return the JSON document.
+
+    Args:
+        file_counts: Numbers of files for processor runs
+        file_sizes: Bytes per file
+        line_lengths: Bytes per line, including the newline
+        concurrencies: max_concurrency values for processor runs
+        repeat: Timed runs per case
+        seed: Seed for the generated inputs
+
+    Returns:
+        Environment metadata and a list of results
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for file_size, line_length in itertools.product(file_sizes, line_lengths):
+            path = os.path.join(directory, "single.txt")
+            generate_file(path, file_size, line_length, seed)
+            case = {'bench': 'reader', 'file_size': file_size, 'line_length': line_length}
+            timings = measure(lambda: bench_reader(path), repeat)
+            results.append(summarize(case, timings, file_size, line_length))
+
+            out_path = os.path.join(directory, "written.txt")
+            case = {'bench': 'writer', 'file_size': file_size, 'line_length': line_length}
+            timings = measure(lambda: bench_writer(out_path, file_size, line_length), repeat)
+            results.append(summarize(case, timings, file_size, line_length))
+
+            for file_count in file_counts:
+                input_dir = os.path.join(directory, f"in_{file_count}")
+                generate_corpus(input_dir, file_count, file_size, line_length, seed)
+                for max_concurrency in concurrencies:
+                    output_dir = os.path.join(directory, "out")
+                    case = {
+                        'bench': 'processor', 'file_size': file_size, 'line_length': line_length,
+                        'files': file_count, 'max_concurrency': max_concurrency,
+                    }
+                    timings = measure(lambda: bench_processor(input_dir, output_dir, max_concurrency), repeat)
+                    results.append(summarize(case, timings, file_size * file_count, line_length))
+
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def case_key(result: Dict[str, Any]) -> tuple:
+    """Return the parameters that identify a result's case, for matching across runs."""
+    return tuple(sorted((name, value) for name, value in result.items()
+                        if name in ('bench', 'file_size', 'line_length', 'files', 'max_concurrency')))
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """
+    Print the change in median time of every case present in both runs.
+
+    Args:
+        current: This run's JSON document
+        baseline: An earlier run's JSON document
+    """
+    if baseline.get('schema_version') != current['schema_version']:
+        print("Baseline has a different schema version; skipping comparison")
+        return
+    previous = {case_key(result): result for result in baseline['results']}
+    print(f"{'case':<80} {'baseline s':>11} {'current s':>11} {'change':>8}")
+    for result in current['results']:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        change = result['median_seconds'] / old['median_seconds'] - 1
+        label = ' '.join(f"{name}={value}" for name, value in case_key(result))
+        print(f"{label:<80} {old['median_seconds']:>11.4f} {result['median_seconds']:>11.4f} {change:>+8.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Async file pipeline benchmark suite")
+    parser.add_argument("--files", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--file-sizes", type=int, nargs="+", default=[4_000_000])
+    parser.add_argument("--line-lengths", type=int, nargs="+", default=[40, 200])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print changes against an earlier JSON result file")
+    args = parser.parse_args()
+
+    document = run(args.files, args.file_sizes, args.line_lengths, args.concurrency,
+                   args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+    elif not args.compare:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(document, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark lines/sec of AsyncFileReader with per-line and chunked reads.
+
+Run from the issue_10 directory:
+
+    python -m benchmarks.bench_reader --lines 200000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List, Optional
+
+from async_io import AsyncFileReader
+
+
+def write_sample_file(path: str, num_lines: int, line_length: int) -> None:
+    """
+    Write a file of fixed-length lines.
+    
+    Args:
+        path: File to write
+        num_lines: Number of lines
+        line_length: Characters per line, including the newline
+    """
+    line = "x" * (line_length - 1) + "\n"
+    with open(path, 'w') as f:
+        f.write(line * num_lines)
+
+
+async def count_lines(path: str, chunk_size: Optional[int]) -> int:
+    """
+    Iterate over a file with AsyncFileReader and count its lines.
+    
+    Args:
+        path: File to read
+        chunk_size: Block size for chunked reading, or None for per-line reads
+        
+    Returns:
+        Number of lines read
+    """
+    count = 0
+    async with AsyncFileReader(path, 'r', chunk_size=chunk_size) as reader:
+        async for _ in reader:
+            count += 1
+    return count
+
+
+async def run(num_lines: int, line_length: int, chunk_sizes: List[Optional[int]]) -> None:
+    """
+    Time each reader mode over the same file and print lines/sec.
+    
+    Args:
+        num_lines: Number of lines in the sample file
+        line_length: Characters per line
+        chunk_sizes: Reader modes to compare; None is the per-line reader
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sample.txt")
+        write_sample_file(path, num_lines, line_length)
+        
+        print(f"{'chunk_size':>12} {'seconds':>10} {'lines/sec':>14}")
+        for chunk_size in chunk_sizes:
+            start = time.perf_counter()
+            count = await count_lines(path, chunk_size)
+            elapsed = time.perf_counter() - start
+            assert count == num_lines
+            label = "per-line" if chunk_size is None else str(chunk_size)
+            print(f"{label:>12} {elapsed:>10.3f} {count / elapsed:>14.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AsyncFileReader lines/sec")
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--line-length", type=int, default=80)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[64 * 1024, 1024 * 1024])
+    args = parser.parse_args()
+    
+    asyncio.run(run(args.lines, args.line_length, [None] + args.chunk_sizes))
+
+
+if __name__ == "__main__":
+    main()
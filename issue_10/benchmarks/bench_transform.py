@@ -0,0 +1,101 @@
+"""
+Benchmark how a CPU-heavy line transform scales across process pool workers.
+
+Run from the issue_10 directory:
+
+    python -m benchmarks.bench_transform --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from typing import List
+
+from processing import AsyncFileProcessor
+
+
+def cpu_heavy_line(line: str) -> str:
+    """
+    Uppercase a line after burning CPU on repeated hashing.
+    
+    Args:
+        line: Input line
+        
+    Returns:
+        Transformed line
+    """
+    digest = line.encode()
+    for _ in range(200):
+        digest = hashlib.sha256(digest).digest()
+    return line.upper()
+
+
+def write_inputs(directory: str, num_files: int, lines_per_file: int) -> List[str]:
+    """
+    Write input files for the benchmark.
+    
+    Args:
+        directory: Directory to write files in
+        num_files: Number of files
+        lines_per_file: Lines per file
+        
+    Returns:
+        Paths of the files written
+    """
+    paths = []
+    for i in range(num_files):
+        path = os.path.join(directory, f"input_{i}.txt")
+        with open(path, 'w') as f:
+            f.write("".join(f"line {j} of file {i}\n" for j in range(lines_per_file)))
+        paths.append(path)
+    return paths
+
+
+async def run(worker_counts: List[int], num_files: int, lines_per_file: int) -> None:
+    """
+    Process the same inputs with each worker count and print lines/sec.
+    
+    Args:
+        worker_counts: Process pool sizes to compare
+        num_files: Number of input files
+        lines_per_file: Lines per input file
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        input_dir = os.path.join(directory, "input")
+        os.makedirs(input_dir)
+        files = write_inputs(input_dir, num_files, lines_per_file)
+        total_lines = num_files * lines_per_file
+        
+        print(f"{'workers':>8} {'seconds':>10} {'lines/sec':>12} {'speedup':>8}")
+        baseline = None
+        for workers in worker_counts:
+            output_dir = os.path.join(directory, f"output_{workers}")
+            processor = AsyncFileProcessor(input_dir, output_dir, max_concurrency=num_files,
+                                           executor="process", workers=workers,
+                                           line_transform=cpu_heavy_line)
+            try:
+                start = time.perf_counter()
+                results = await processor.process_files(files)
+                elapsed = time.perf_counter() - start
+            finally:
+                processor.close()
+            assert all(results.values())
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>10.3f} {total_lines / elapsed:>12.0f} {baseline / elapsed:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process pool transform scaling")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--lines", type=int, default=20_000)
+    args = parser.parse_args()
+    
+    asyncio.run(run(sorted(set(args.workers)), args.files, args.lines))
+
+
+if __name__ == "__main__":
+    main()
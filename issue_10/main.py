@@ -3,11 +3,10 @@ Main entry point for the async file processor example.
 """
 
 import asyncio
-import os
 import time
 import random
 from processing import AsyncFileProcessor
-from utils import create_test_files, verify_output_files
+from utils import create_test_files, discover_files, verify_output_files
 
 
 async def process_directory(input_dir: str, output_dir: str) -> None:
@@ -18,21 +17,26 @@ async def process_directory(input_dir: str, output_dir: str) -> None:
         input_dir: Input directory
         output_dir: Output directory
     """
-    # Get all files in the input directory
-    files = [os.path.join(input_dir, f) for f in os.listdir(input_dir) if os.path.isfile(os.path.join(input_dir, f))]
-    
     # Create processor
     processor = AsyncFileProcessor(input_dir, output_dir)
     
-    # Process files
+    # Process files as they are discovered, rather than listing the directory first.
+    # Outputs are named after the input's base name in one flat directory, so only
+    # top-level files are taken; same-named files in subdirectories would collide.
     start_time = time.time()
-    results = await processor.process_files(files)
+    results = await processor.process_files(discover_files(input_dir, recursive=False))
     end_time = time.time()
     
     # Print results
     success_count = sum(1 for success in results.values() if success)
     print(f"\nProcessed {len(results)} files in {end_time - start_time:.2f} seconds")
     print(f"Success: {success_count}, Failed: {len(results) - success_count}")
+    
+    stats = processor.stats.snapshot()
+    print(f"Throughput: {stats['input_rate'] / 1e6:.2f} M chars/s, {stats['lines_per_second']:.0f} lines/s")
+    print(f"Stage time: read {stats['read_time']:.3f}s, transform {stats['transform_time']:.3f}s, "
+          f"write {stats['write_time']:.3f}s, executor wait {stats['executor_wait_time']:.3f}s, "
+          f"queued {stats['queue_time']:.3f}s")
 
 
 async def main():
@@ -2,8 +2,27 @@
 Package for file processing utilities.
 """
 
+from .concurrency import AdaptiveLimiter
 from .file_processor import AsyncFileProcessor
+from .manifest import Manifest
+from .metrics import FileStats, PipelineStats
+from .transforms import (
+    apply_line_transform,
+    batch_from_line_transform,
+    uppercase_block,
+    uppercase_bytes,
+    uppercase_line,
+)
 
 __all__ = [
-    'AsyncFileProcessor'
+    'AdaptiveLimiter',
+    'AsyncFileProcessor',
+    'FileStats',
+    'Manifest',
+    'PipelineStats',
+    'apply_line_transform',
+    'batch_from_line_transform',
+    'uppercase_block',
+    'uppercase_bytes',
+    'uppercase_line'
 ]
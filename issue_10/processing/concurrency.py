@@ -0,0 +1,178 @@
+"""
+Adaptive concurrency limits for the file processor.
+
+AdaptiveLimiter is a drop-in replacement for the processor's
+asyncio.Semaphore whose limit moves at runtime. Every window of completed
+files it compares the window's throughput and per-byte latency with what it
+has seen before, and raises or lowers the number of files allowed in flight
+within fixed bounds.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+ALGORITHMS = ('aimd', 'gradient')
+
+
+class AdaptiveLimiter:
+    """
+    An async context manager that limits in-flight work to an adaptive limit.
+
+    With 'aimd' the limit grows by one after every healthy window and is cut
+    by `backoff` when latency rises past `latency_tolerance` times the best
+    latency seen, throughput falls, or a file fails. With 'gradient' the limit
+    is scaled by the ratio of the best latency to the current one, plus a
+    queue allowance of sqrt(limit), so it settles where latency starts to
+    climb.
+
+    Latency is measured per byte of input, so files of different sizes
+    are comparable.
+    """
+
+    def __init__(self, min_limit: int = 1, max_limit: int = 64,
+                 initial_limit: Optional[int] = None, algorithm: str = 'aimd',
+                 window: int = 8, backoff: float = 0.7, latency_tolerance: float = 2.0,
+                 history_size: int = 100):
+        """
+        Initialize the limiter.
+
+        Args:
+            min_limit: Lowest limit the controller may choose
+            max_limit: Highest limit the controller may choose
+            initial_limit: Starting limit; defaults to 5 clamped to the bounds
+            algorithm: 'aimd' or 'gradient'
+            window: Minimum number of completions per adjustment; a window is
+                also at least as long as the current limit
+            backoff: Factor the limit is multiplied by on a decrease (aimd)
+            latency_tolerance: Latency over the best seen, as a ratio, that
+                counts as congestion (aimd)
+            history_size: Number of recent decisions kept for stats
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {ALGORITHMS}")
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = self._clamp(5 if initial_limit is None else initial_limit)
+        self.algorithm = algorithm
+        self.window = window
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.best_latency: Optional[float] = None
+        self.last_throughput: Optional[float] = None
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._condition = asyncio.Condition()
+        self._reset_window()
+
+    def _clamp(self, limit: float) -> int:
+        return max(self.min_limit, min(self.max_limit, int(limit)))
+
+    def _reset_window(self) -> None:
+        self._window_started = time.perf_counter()
+        self._window_count = 0
+        self._window_bytes = 0
+        self._window_seconds = 0.0
+        self._window_failures = 0
+
+    async def __aenter__(self):
+        """Wait until fewer than `limit` files are in flight, then take a slot."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Release the slot."""
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def record(self, seconds: float, size: int, success: bool) -> None:
+        """
+        Record one finished file and adjust the limit at the end of a window.
+
+        Args:
+            seconds: Time the file spent being processed, excluding queueing
+            size: Input size of the file
+            success: Whether the file was processed successfully
+        """
+        self._window_count += 1
+        self._window_bytes += size
+        self._window_seconds += seconds
+        if not success:
+            self._window_failures += 1
+        if self._window_count >= max(self.window, self.limit):
+            self._adjust()
+
+    def _adjust(self) -> None:
+        """Pick a new limit from the window that just ended."""
+        elapsed = time.perf_counter() - self._window_started
+        throughput = self._window_bytes / elapsed if elapsed > 0 else 0.0
+        latency = self._window_seconds / max(self._window_bytes, 1)
+        failures = self._window_failures
+        self._reset_window()
+
+        if self.best_latency is None or latency < self.best_latency:
+            self.best_latency = latency
+        previous_throughput = self.last_throughput
+        self.last_throughput = throughput
+
+        old_limit = self.limit
+        if self.algorithm == 'aimd':
+            congested = (failures > 0
+                         or latency > self.best_latency * self.latency_tolerance
+                         or (previous_throughput is not None and throughput < previous_throughput * self.backoff))
+            if congested:
+                new_limit = self._clamp(old_limit * self.backoff)
+                reason = 'failures' if failures else 'congestion'
+            else:
+                new_limit = self._clamp(old_limit + 1)
+                reason = 'healthy'
+        else:
+            gradient = max(0.5, min(1.0, self.best_latency / latency)) if latency > 0 else 1.0
+            if failures:
+                gradient = 0.5
+            new_limit = self._clamp(round(old_limit * gradient + math.sqrt(old_limit)))
+            reason = f'gradient {gradient:.2f}'
+
+        if new_limit > old_limit:
+            self.increases += 1
+        elif new_limit < old_limit:
+            self.decreases += 1
+        self.limit = new_limit
+        self.history.append({
+            'limit': new_limit,
+            'previous_limit': old_limit,
+            'throughput': throughput,
+            'latency_per_byte': latency,
+            'reason': reason,
+        })
+        if new_limit > old_limit:
+            asyncio.ensure_future(self._wake_waiters())
+
+    async def _wake_waiters(self) -> None:
+        """Let queued files start after the limit was raised."""
+        async with self._condition:
+            self._condition.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current limit, the bounds and the recent decisions as a dict."""
+        return {
+            'algorithm': self.algorithm,
+            'limit': self.limit,
+            'min_limit': self.min_limit,
+            'max_limit': self.max_limit,
+            'in_flight': self.in_flight,
+            'increases': self.increases,
+            'decreases': self.decreases,
+            'best_latency_per_byte': self.best_latency,
+            'last_throughput': self.last_throughput,
+            'history': list(self.history),
+        }
@@ -0,0 +1,137 @@
+"""
+A durable record of which input files have been processed, and how far.
+
+The manifest is a JSON Lines journal: every update is appended as one line and
+fsynced, and opening the manifest replays the journal into a dict, so lookups
+are O(1) and a crash loses at most the update being written.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+DONE = 'done'
+PARTIAL = 'partial'
+
+
+def file_digest(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Return the BLAKE2b hex digest of a file's content, read in chunks.
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Bytes to read at a time
+
+    Returns:
+        Hex digest of the content
+    """
+    digest = hashlib.blake2b()
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fsync_directory(directory: str) -> None:
+    """Make renames and new files in a directory durable, where the OS allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Some platforms and filesystems can't fsync a directory
+        pass
+    finally:
+        os.close(fd)
+
+
+class Manifest:
+    """Persistent per-file processing state, keyed on the input path."""
+
+    def __init__(self, path: str):
+        """
+        Open a manifest, creating it if it doesn't exist.
+
+        The journal is compacted on open, so it holds one line per file.
+
+        Args:
+            path: Path to the manifest file
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+        self._compact()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self) -> None:
+        """Replay the journal; later lines replace earlier ones for the same path."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash mid-append
+                        break
+                    self.entries[entry['path']] = entry
+        except FileNotFoundError:
+            pass
+
+    def _compact(self) -> None:
+        """Atomically rewrite the journal with only the current entries."""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        fsync_directory(os.path.dirname(os.path.abspath(self.path)))
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for an input file, or None if it has none."""
+        return self.entries.get(file_path)
+
+    @staticmethod
+    def matches(entry: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+        """Return True if an entry was recorded for a file with this size and mtime."""
+        return (entry is not None
+                and entry['size'] == stat.st_size
+                and entry['mtime_ns'] == stat.st_mtime_ns)
+
+    def record(self, file_path: str, stat: os.stat_result, status: str, **fields: Any) -> None:
+        """
+        Durably record the state of an input file, replacing any earlier entry.
+
+        Args:
+            file_path: Path to the input file
+            stat: Result of os.stat() on the input when processing started
+            status: DONE or PARTIAL
+            **fields: Extra JSON-serializable fields, such as resume offsets
+        """
+        entry = {
+            'path': file_path,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'status': status,
+            **fields,
+        }
+        line = json.dumps(entry) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.entries[file_path] = entry
+
+    def close(self) -> None:
+        """Close the journal."""
+        with self._lock:
+            self._file.close()
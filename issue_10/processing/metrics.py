@@ -0,0 +1,138 @@
+"""
+Per-file and aggregate instrumentation for the file processor.
+
+Stage times are measured with time.perf_counter() around each awaited read,
+transform and write of a block, so the overhead is a few clock reads per
+block rather than per line.
+"""
+
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class FileStats:
+    """
+    Timings and sizes for one processed file.
+
+    Sizes are in characters in text mode and bytes in binary mode. Times are
+    in seconds. When the transform runs on an executor its time shows up as
+    executor_wait_time rather than transform_time. queue_time runs from when
+    the file was queued until it got a worker and a concurrency slot, and
+    started_at is when it was queued.
+    """
+    path: str
+    success: bool = False
+    error: Optional[str] = None
+    input_size: int = 0
+    output_size: int = 0
+    lines: int = 0
+    queue_time: float = 0.0
+    read_time: float = 0.0
+    transform_time: float = 0.0
+    write_time: float = 0.0
+    executor_wait_time: float = 0.0
+    max_executor_depth: int = 0
+    total_time: float = 0.0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def processing_time(self) -> float:
+        """Seconds spent on the file after it got a worker and a slot."""
+        return self.total_time - self.queue_time
+
+    @property
+    def input_rate(self) -> float:
+        """Input processed per second of the file's processing time."""
+        processing_time = self.processing_time
+        return self.input_size / processing_time if processing_time > 0 else 0.0
+
+    @property
+    def lines_per_second(self) -> float:
+        """Output lines per second of the file's processing time."""
+        processing_time = self.processing_time
+        return self.lines / processing_time if processing_time > 0 else 0.0
+
+    def finish(self, success: bool, error: Optional[BaseException] = None) -> None:
+        """Record the outcome and stop the file's clock."""
+        self.success = success
+        self.error = None if error is None else str(error)
+        self.total_time = time.perf_counter() - self.started_at
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the stats and rates as a plain dict."""
+        result = {f.name: getattr(self, f.name) for f in fields(self) if f.name != 'started_at'}
+        result['processing_time'] = self.processing_time
+        result['input_rate'] = self.input_rate
+        result['lines_per_second'] = self.lines_per_second
+        return result
+
+
+# FileStats fields that PipelineStats sums across files
+_SUMMED = ('input_size', 'output_size', 'lines', 'queue_time', 'read_time',
+           'transform_time', 'write_time', 'executor_wait_time')
+
+
+class PipelineStats:
+    """Totals across every file a processor has handled, plus wall-clock rates."""
+
+    def __init__(self, limiter: Optional[Any] = None):
+        """
+        Start with empty totals.
+
+        Args:
+            limiter: Optional adaptive concurrency limiter whose state is
+                included in snapshots
+        """
+        self.limiter = limiter
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all totals."""
+        self.files_processed = 0
+        self.files_failed = 0
+        self.files_skipped = 0
+        self.max_executor_depth = 0
+        self.totals = dict.fromkeys(_SUMMED, 0)
+        self.first_started: Optional[float] = None
+        self.last_finished: Optional[float] = None
+
+    def record(self, stats: FileStats) -> None:
+        """Add a finished file's stats to the totals."""
+        if stats.success:
+            self.files_processed += 1
+        else:
+            self.files_failed += 1
+        for name in _SUMMED:
+            self.totals[name] += getattr(stats, name)
+        self.max_executor_depth = max(self.max_executor_depth, stats.max_executor_depth)
+        if self.first_started is None or stats.started_at < self.first_started:
+            self.first_started = stats.started_at
+        finished = stats.started_at + stats.total_time
+        if self.last_finished is None or finished > self.last_finished:
+            self.last_finished = finished
+
+    @property
+    def wall_time(self) -> float:
+        """Seconds from the first file starting to the last file finishing."""
+        if self.first_started is None:
+            return 0.0
+        return self.last_finished - self.first_started
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the totals and aggregate rates as a plain dict."""
+        wall_time = self.wall_time
+        result = {
+            'files_processed': self.files_processed,
+            'files_failed': self.files_failed,
+            'files_skipped': self.files_skipped,
+            'max_executor_depth': self.max_executor_depth,
+            'wall_time': wall_time,
+            **self.totals,
+        }
+        result['input_rate'] = self.totals['input_size'] / wall_time if wall_time else 0.0
+        result['lines_per_second'] = self.totals['lines'] / wall_time if wall_time else 0.0
+        if self.limiter is not None:
+            result['concurrency'] = self.limiter.snapshot()
+        return result
@@ -0,0 +1,135 @@
+"""
+Splitting large files into newline-aligned byte ranges that can be
+transformed independently.
+
+The functions here are synchronous and module-level, so the processor can run
+them on a thread pool or send them to worker processes.
+"""
+
+import io
+import os
+import shutil
+from typing import Callable, List, Optional, Tuple
+
+from async_io import DEFAULT_CHUNK_SIZE
+
+
+def shard_ranges(file_path: str, shard_size: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into byte ranges of about shard_size, each ending after a newline.
+
+    Every range except possibly the last ends just after a b'\\n', so no line
+    is split between two ranges.
+
+    Args:
+        file_path: Path to the file
+        shard_size: Target size of each range in bytes
+
+    Returns:
+        List of (start, end) byte offsets covering the whole file
+    """
+    size = os.path.getsize(file_path)
+    ranges = []
+    start = 0
+    with open(file_path, 'rb') as f:
+        while start < size:
+            end = start + shard_size
+            if end >= size:
+                end = size
+            else:
+                # Finish the line the nominal end falls in; a newline right
+                # before it means the range is already aligned
+                f.seek(end - 1)
+                end += len(f.readline()) - 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def transform_shard(input_path: str, output_path: str, start: int, end: int,
+                    transform: Callable, binary: bool,
+                    output_offset: Optional[int] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Transform the byte range [start, end) of a file, block by block.
+
+    In text mode each block is decoded the way open(path, 'r') would, so the
+    output matches processing the file sequentially.
+
+    Args:
+        input_path: Path to the input file
+        output_path: File to write the transformed range to
+        start: Offset of the first byte of the range
+        end: Offset just past the last byte of the range
+        transform: Batch transform applied to each block of whole lines
+        binary: Whether blocks are bytes rather than text
+        output_offset: If given, the transform must preserve length and the
+            output is written into the existing output_path at this offset
+            with os.pwrite. Otherwise output_path is created and written from
+            the start.
+        chunk_size: Approximate size of each block in bytes
+
+    Returns:
+        Number of input bytes transformed
+    """
+    fd = None
+    output_file = None
+    if output_offset is not None:
+        fd = os.open(output_path, os.O_WRONLY)
+    else:
+        output_file = open(output_path, 'wb' if binary else 'w')
+
+    position = start
+    try:
+        with open(input_path, 'rb') as input_file:
+            input_file.seek(start)
+            while position < end:
+                data = input_file.read(min(chunk_size, end - position))
+                if not data:
+                    break
+                if not data.endswith(b'\n') and position + len(data) < end:
+                    data += input_file.readline(end - position - len(data))
+
+                if binary:
+                    result = transform(data)
+                else:
+                    result = transform(io.TextIOWrapper(io.BytesIO(data)).read())
+
+                if fd is not None:
+                    os.pwrite(fd, result, output_offset + position - start)
+                else:
+                    output_file.write(result)
+                position += len(data)
+    finally:
+        if fd is not None:
+            os.close(fd)
+        else:
+            output_file.close()
+    return position - start
+
+
+def preallocate(output_path: str, size: int) -> None:
+    """
+    Create or truncate output_path and extend it to size bytes, for positioned writes.
+
+    Args:
+        output_path: File to create
+        size: Final size of the file in bytes
+    """
+    with open(output_path, 'wb') as output_file:
+        output_file.truncate(size)
+
+
+def append_parts(output_path: str, part_paths: List[str]) -> None:
+    """
+    Append part files to output_path in order, deleting each part once copied.
+
+    Args:
+        output_path: File to append to
+        part_paths: Part files, in output order
+    """
+    with open(output_path, 'ab') as output_file:
+        for part_path in part_paths:
+            with open(part_path, 'rb') as part_file:
+                shutil.copyfileobj(part_file, output_file, DEFAULT_CHUNK_SIZE)
+            os.remove(part_path)
@@ -0,0 +1,95 @@
+"""
+Transforms for the file processor.
+
+A batch transform takes a block of whole lines, as read by the chunked
+reader, and returns the transformed block. A line transform takes a single
+line. In binary mode blocks are bytes-like (bytes or a memoryview of the
+reader's buffer) and must come back as bytes. Transforms are plain
+module-level functions so they can be pickled and sent to worker processes
+when the processor runs with a process pool.
+
+A binary transform whose output is always exactly as long as its input can
+set a `length_preserving = True` attribute; sharded files are then written in
+place with positioned writes instead of being stitched together.
+"""
+
+import functools
+import io
+from typing import Callable, Union
+
+
+def uppercase_line(line: str) -> str:
+    """
+    Convert a line to uppercase.
+    
+    Args:
+        line: Input line
+        
+    Returns:
+        Transformed line
+    """
+    return line.upper()
+
+
+def uppercase_block(block: str) -> str:
+    """
+    Convert a whole block of lines to uppercase in one call.
+    
+    Args:
+        block: Block of whole lines
+        
+    Returns:
+        Transformed block
+    """
+    return block.upper()
+
+
+def uppercase_bytes(block: Union[bytes, memoryview]) -> bytes:
+    """
+    Convert a binary block to uppercase with a single bytes.upper() call.
+    
+    Only ASCII letters change, so the result is as long as the input and
+    UTF-8 text stays valid; non-ASCII letters are left as they are. A
+    memoryview is copied to bytes first, since views have no upper(); the
+    copy costs a few percent of the upper() pass itself.
+    
+    Args:
+        block: Block of whole lines, as bytes or a memoryview
+        
+    Returns:
+        Transformed block
+    """
+    # bytes() of a bytes object is free
+    return bytes(block).upper()
+
+
+uppercase_bytes.length_preserving = True
+
+
+def apply_line_transform(transform: Callable, block: Union[str, bytes, memoryview]) -> Union[str, bytes]:
+    """
+    Apply a line transform to every line of a block.
+    
+    Args:
+        transform: Function applied to each line
+        block: Block of whole lines, as text or bytes-like
+        
+    Returns:
+        Transformed block
+    """
+    if isinstance(block, str):
+        return ''.join(map(transform, io.StringIO(block, newline='\n')))
+    return b''.join(map(transform, io.BytesIO(block)))
+
+
+def batch_from_line_transform(transform: Callable[[str], str]) -> Callable[[str], str]:
+    """
+    Wrap a line transform as a batch transform.
+    
+    Args:
+        transform: Function applied to each line
+        
+    Returns:
+        A picklable batch transform applying `transform` line by line
+    """
+    return functools.partial(apply_line_transform, transform)
@@ -0,0 +1,147 @@
+"""
+Tests for resuming interrupted files through the manifest.
+"""
+
+import asyncio
+import contextlib
+import gzip
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from processing import AsyncFileProcessor
+from processing.manifest import PARTIAL
+from processing.transforms import uppercase_block, uppercase_bytes
+
+# Several reader chunks, so a file is checkpointed more than once before the crash
+FILE_LINES = 120_000
+CHECKPOINT_INTERVAL = 1024 * 1024
+
+
+class CrashingTransform:
+    """Uppercase blocks, raising on the crash_at'th call if set."""
+
+    def __init__(self):
+        self.calls = 0
+        self.crash_at = None
+
+    def __call__(self, block):
+        self.calls += 1
+        if self.crash_at is not None and self.calls == self.crash_at:
+            raise RuntimeError("simulated crash")
+        if isinstance(block, str):
+            return uppercase_block(block)
+        return uppercase_bytes(block)
+
+
+def write_input(path):
+    """Write lines of varying length with non-ASCII text and CRLF endings."""
+    rng = random.Random(0)
+    lines = [f"héllo {i} {'x' * rng.randint(0, 120)}\r\n" for i in range(FILE_LINES)]
+    data = "".join(lines).encode('utf-8')
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wb') as f:
+        f.write(data)
+
+
+def read_output(path):
+    """Return an output file's content, decompressed if it is gzip."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return f.read()
+
+
+class ManifestResumeTest(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.input_dir = os.path.join(self.directory, 'in')
+        os.makedirs(self.input_dir)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def run_processor(self, files, output_dir, transform, manifest_path, **options):
+        processor = AsyncFileProcessor(
+            self.input_dir, output_dir, batch_transform=transform, manifest_path=manifest_path,
+            checkpoint_interval=CHECKPOINT_INTERVAL, **options)
+        try:
+            # The processor reports failed files on stdout
+            with contextlib.redirect_stdout(io.StringIO()):
+                return asyncio.run(processor.process_files(files)), processor
+        finally:
+            processor.close()
+
+    def check_resume(self, name, **options):
+        input_path = os.path.join(self.input_dir, name)
+        write_input(input_path)
+        output_path = os.path.join(self.directory, 'out', f"processed_{name}")
+        manifest_path = os.path.join(self.directory, 'manifest.jsonl')
+
+        # Reference output from an uninterrupted run without a manifest
+        transform = CrashingTransform()
+        reference_dir = os.path.join(self.directory, 'reference')
+        self.run_processor([input_path], reference_dir, transform, None, **options)
+        expected = read_output(os.path.join(reference_dir, f"processed_{name}"))
+        full_run_calls = transform.calls
+        self.assertGreater(full_run_calls, 5)
+
+        # Crash after several checkpoints
+        transform = CrashingTransform()
+        transform.crash_at = 4
+        results, _ = self.run_processor([input_path], os.path.dirname(output_path), transform,
+                                        manifest_path, **options)
+        self.assertEqual(results, {input_path: False})
+        self.assertFalse(os.path.exists(output_path))
+        with open(manifest_path) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(entries[-1]['status'], PARTIAL)
+        self.assertGreater(entries[-1]['input_offset'], 0)
+
+        # Resume: only the blocks after the last checkpoint are transformed again
+        transform = CrashingTransform()
+        results, _ = self.run_processor([input_path], os.path.dirname(output_path), transform,
+                                        manifest_path, **options)
+        self.assertEqual(results, {input_path: True})
+        self.assertLess(transform.calls, full_run_calls)
+        # gzip members depend on where the resume started, so compare the content
+        self.assertEqual(read_output(output_path), expected)
+        self.assertFalse(os.path.exists(output_path + '.tmp'))
+
+    def test_resume_text(self):
+        self.check_resume('input.txt')
+
+    def test_resume_binary(self):
+        self.check_resume('input.txt', binary=True)
+
+    def test_resume_gzip(self):
+        self.check_resume('input.txt.gz', binary=True, compression='auto')
+
+    def test_finished_file_is_skipped_until_output_is_deleted(self):
+        input_path = os.path.join(self.input_dir, 'input.txt')
+        write_input(input_path)
+        output_dir = os.path.join(self.directory, 'out')
+        output_path = os.path.join(output_dir, 'processed_input.txt')
+        manifest_path = os.path.join(self.directory, 'manifest.jsonl')
+        transform = CrashingTransform()
+
+        results, _ = self.run_processor([input_path], output_dir, transform, manifest_path)
+        self.assertEqual(results, {input_path: True})
+        expected = read_output(output_path)
+
+        results, processor = self.run_processor([input_path], output_dir, transform, manifest_path)
+        self.assertEqual(results, {})
+        self.assertEqual(processor.stats.files_skipped, 1)
+
+        os.remove(output_path)
+        results, _ = self.run_processor([input_path], output_dir, transform, manifest_path)
+        self.assertEqual(results, {input_path: True})
+        self.assertEqual(read_output(output_path), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
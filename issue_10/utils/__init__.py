@@ -2,9 +2,21 @@
 Package for utility functions.
 """
 
-from .file_utils import create_test_files, verify_output_files
+from .discovery import discover_files, scan_files
+from .file_utils import (
+    compare_file,
+    create_test_files,
+    generate_corpus,
+    generate_file,
+    verify_output_files,
+)
 
 __all__ = [
+    'compare_file',
     'create_test_files',
+    'discover_files',
+    'generate_corpus',
+    'generate_file',
+    'scan_files',
     'verify_output_files'
 ]
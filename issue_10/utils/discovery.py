@@ -0,0 +1,112 @@
+"""
+Streaming discovery of input files with os.scandir.
+"""
+
+import asyncio
+import fnmatch
+import os
+import re
+import threading
+from typing import AsyncIterator, Iterator, List, Optional
+
+# Paths handed from the scanning thread to the event loop per executor call
+DEFAULT_BATCH_SIZE = 1000
+
+
+def scan_files(directory: str, pattern: str = '*', recursive: bool = True,
+               min_size: Optional[int] = None, max_size: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the paths of regular files under a directory that pass the filters.
+
+    Directory entries come from os.scandir, whose file type comes with the
+    listing itself on most platforms, so no per-entry stat() is made unless a
+    size filter is given. Symbolic links to directories are not followed.
+
+    Args:
+        directory: Directory to search
+        pattern: Glob pattern the file name must match, e.g. '*.txt'
+        recursive: Whether to descend into subdirectories
+        min_size: Smallest file size in bytes to include
+        max_size: Largest file size in bytes to include
+
+    Yields:
+        File paths, in directory listing order
+    """
+    match = re.compile(fnmatch.translate(pattern)).match
+    check_size = min_size is not None or max_size is not None
+    pending = [directory]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                    continue
+                if not entry.is_file() or not match(entry.name):
+                    continue
+                if check_size:
+                    size = entry.stat().st_size
+                    if min_size is not None and size < min_size:
+                        continue
+                    if max_size is not None and size > max_size:
+                        continue
+                yield entry.path
+
+
+def _next_batch(paths: Iterator[str], batch_size: int, lock: threading.Lock,
+                stop: threading.Event) -> List[str]:
+    """Take up to batch_size paths from the scan, or fewer once stopped; runs in the executor."""
+    batch = []
+    with lock:
+        for path in paths:
+            batch.append(path)
+            if len(batch) >= batch_size or stop.is_set():
+                break
+    return batch
+
+
+def _close_scan(paths: Iterator[str], lock: threading.Lock) -> None:
+    """Close the scan once no batch is using it; runs in the executor."""
+    with lock:
+        # Closes the open scandir iterators
+        paths.close()
+
+
+async def discover_files(directory: str, pattern: str = '*', recursive: bool = True,
+                         min_size: Optional[int] = None, max_size: Optional[int] = None,
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[str]:
+    """
+    Asynchronously yield the files under a directory as they are found.
+
+    The scan runs in the executor and hands over batch_size paths at a time,
+    so processing can start before the directory has been listed in full and
+    only one batch of paths is held in memory.
+
+    Args:
+        directory: Directory to search
+        pattern: Glob pattern the file name must match, e.g. '*.txt'
+        recursive: Whether to descend into subdirectories
+        min_size: Smallest file size in bytes to include
+        max_size: Largest file size in bytes to include
+        batch_size: Number of paths to fetch per executor call
+
+    Yields:
+        File paths
+    """
+    loop = asyncio.get_running_loop()
+    paths = scan_files(directory, pattern, recursive, min_size, max_size)
+    # Cancelling an await does not stop a batch already running in a worker
+    # thread, so the scan is only closed under the lock a batch holds
+    lock = threading.Lock()
+    stop = threading.Event()
+    try:
+        while True:
+            batch = await loop.run_in_executor(None, _next_batch, paths, batch_size, lock, stop)
+            if not batch:
+                break
+            for path in batch:
+                yield path
+    finally:
+        stop.set()
+        # Shielded so the scan is still closed if this wait is cancelled too
+        await asyncio.shield(loop.run_in_executor(None, _close_scan, paths, lock))
@@ -2,8 +2,28 @@
 Utility functions for file operations.
 """
 
+import hashlib
+import locale
 import os
+import random
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
 from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Set
+
+from async_io.compression import open_file
+
+# Block size for streaming verification
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+# Lines joined into one write by create_test_files
+_LINES_PER_WRITE = 10_000
+
+# Bytes generated and written at a time by generate_file
+GENERATE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Maps every byte value to a lowercase letter or a space, for generated text
+_TEXT_ALPHABET = b'abcdefghijklmnopqrstuvwxyz    '
+_TEXT_TABLE = bytes(_TEXT_ALPHABET[value % len(_TEXT_ALPHABET)] for value in range(256))
 
 
 def create_test_files(directory: str, num_files: int, lines_per_file: int) -> None:
@@ -19,67 +39,227 @@ def create_test_files(directory: str, num_files: int, lines_per_file: int) -> No
     
     for i in range(num_files):
         file_path = os.path.join(directory, f"test_file_{i}.txt")
+        # One timestamp per file and one write per batch of lines, instead of per line
+        created_at = datetime.now().isoformat()
         with open(file_path, 'w') as f:
-            for j in range(lines_per_file):
-                f.write(f"This is line {j} in file {i}, created at {datetime.now().isoformat()}\n")
+            for first in range(0, lines_per_file, _LINES_PER_WRITE):
+                last = min(first + _LINES_PER_WRITE, lines_per_file)
+                f.write(''.join(f"This is line {j} in file {i}, created at {created_at}\n"
+                                for j in range(first, last)))
     
     print(f"Created {num_files} test files in {directory}")
 
 
-def verify_output_files(input_dir: str, output_dir: str) -> int:
+def generate_file(path: str, size: int, line_length: int = 80, seed: int = 0) -> None:
+    """
+    Write a file of random lowercase text in fixed-length lines, reproducibly.
+    
+    Random bytes are mapped to letters and spaces with bytes.translate() and
+    newlines are set with one slice assignment per buffer, so there is no
+    per-line Python work and GB-sized files take seconds.
+    
+    Args:
+        path: File to write
+        size: Size of the file in bytes; the last line is cut short if the
+            size is not a multiple of line_length
+        line_length: Bytes per line, including the newline
+        seed: Seed for the random content; the same seed gives the same file
+    """
+    if line_length < 1:
+        raise ValueError("line_length must be at least 1")
+    rng = random.Random(seed)
+    # Whole lines per buffer, so every buffer starts at the start of a line
+    buffer_size = max(1, GENERATE_BUFFER_SIZE // line_length) * line_length
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining > 0:
+            buffer = bytearray(rng.randbytes(min(buffer_size, remaining)).translate(_TEXT_TABLE))
+            buffer[line_length - 1::line_length] = b'\n' * (len(buffer) // line_length)
+            f.write(buffer)
+            remaining -= len(buffer)
+
+
+def generate_corpus(directory: str, num_files: int, file_size: int,
+                    line_length: int = 80, seed: int = 0) -> List[str]:
+    """
+    Create a directory of generated files, each with its own seed derived from seed.
+    
+    Args:
+        directory: Directory to create files in
+        num_files: Number of files to create
+        file_size: Size of each file in bytes
+        line_length: Bytes per line, including the newline
+        seed: Base seed for the whole corpus
+        
+    Returns:
+        Paths of the files created
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(num_files):
+        path = os.path.join(directory, f"generated_{i}.txt")
+        generate_file(path, file_size, line_length, seed * 1_000_003 + i)
+        paths.append(path)
+    return paths
+
+
+def _first_difference(expected: bytes, actual: bytes) -> int:
+    """Return the length of the common prefix of two byte strings, by binary search."""
+    expected_view, actual_view = memoryview(expected), memoryview(actual)
+    low, high = 0, min(len(expected), len(actual))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if expected_view[:middle] == actual_view[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _transformed_blocks(input_path: str, transform: Callable, binary: bool,
+                        block_size: int, compression: Optional[str]) -> Iterator[bytes]:
+    """Yield the expected output of a file as encoded blocks of whole lines."""
+    encoding = locale.getpreferredencoding(False)
+    newline = b'\n' if binary else '\n'
+    with open_file(input_path, 'rb' if binary else 'r', compression) as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            if not block.endswith(newline):
+                block += f.readline()
+            result = transform(block)
+            yield result if binary else result.encode(encoding)
+
+
+def compare_file(input_path: str, output_path: str, transform: Optional[Callable] = None,
+                 binary: bool = False, method: str = 'block', block_size: int = DEFAULT_BLOCK_SIZE,
+                 compression: Optional[str] = None) -> Optional[int]:
+    """
+    Check an output file against its transformed input, streaming both.
+    
+    Memory use is a few blocks regardless of the file size.
+    
+    Args:
+        input_path: Path to the input file
+        output_path: Path to the output file
+        transform: Function applied to each block of whole lines of the input
+            to get the expected output; defaults to uppercasing
+        binary: Whether blocks are bytes rather than text. Text blocks are
+            encoded like open() would before comparing.
+        method: 'block' to compare the expected and actual output block by
+            block, or 'digest' to compare BLAKE2b digests of the two
+            streams first and only compare blocks to locate a difference
+        block_size: Approximate size of each block read
+        compression: None, 'auto' or a codec name for both files
+        
+    Returns:
+        The byte offset in the output of the first difference, or None if
+        the output matches. A truncated or overlong output differs at the
+        end of the shorter file.
+    """
+    if transform is None:
+        transform = bytes.upper if binary else str.upper
+    
+    if method == 'digest':
+        expected_digest = hashlib.blake2b()
+        for block in _transformed_blocks(input_path, transform, binary, block_size, compression):
+            expected_digest.update(block)
+        actual_digest = hashlib.blake2b()
+        with open_file(output_path, 'rb', compression) as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                actual_digest.update(block)
+        if expected_digest.digest() == actual_digest.digest():
+            return None
+    elif method != 'block':
+        raise ValueError(f"Unknown method {method!r}, expected 'block' or 'digest'")
+    
+    offset = 0
+    with open_file(output_path, 'rb', compression) as f:
+        for expected in _transformed_blocks(input_path, transform, binary, block_size, compression):
+            actual = f.read(len(expected))
+            if actual != expected:
+                return offset + _first_difference(expected, actual)
+            offset += len(expected)
+        if f.read(1):
+            return offset
+    return None
+
+
+def _verify_one(input_dir: str, output_dir: str, name: str, options: dict) -> Optional[str]:
+    """Check one input file's output; return a description of the problem, or None."""
+    output_name = f"processed_{name}"
+    output_path = os.path.join(output_dir, output_name)
+    if not os.path.exists(output_path):
+        return f"Missing output file: {output_name}"
+    offset = compare_file(os.path.join(input_dir, name), output_path, **options)
+    if offset is not None:
+        return f"Content mismatch in {name} at byte {offset} of {output_name}"
+    return None
+
+
+def verify_output_files(input_dir: str, output_dir: str, transform: Optional[Callable] = None,
+                        binary: bool = False, method: str = 'block', workers: Optional[int] = None,
+                        block_size: int = DEFAULT_BLOCK_SIZE, compression: Optional[str] = None) -> int:
     """
     Verify that output files match the transformed input files.
     
+    Files are checked in parallel on a process pool, streaming each one in
+    blocks, and only a bounded number of files is queued at a time.
+    
     Args:
         input_dir: Directory containing input files
         output_dir: Directory containing output files
+        transform: Block transform the outputs were made with; must be
+            picklable. Defaults to uppercasing.
+        binary: Whether the files were processed as bytes
+        method: 'block' or 'digest', see compare_file
+        workers: Number of worker processes; defaults to the CPU count, and
+            1 checks the files in this process
+        block_size: Approximate size of each block read
+        compression: None, 'auto' or a codec name, see compare_file
         
     Returns:
         Number of issues found
     """
     print("\nVerifying output files...")
-    input_files = os.listdir(input_dir)
-    output_files = os.listdir(output_dir)
+    options = dict(transform=transform, binary=binary, method=method,
+                   block_size=block_size, compression=compression)
+    workers = workers or os.cpu_count() or 1
     
-    print(f"Input files: {len(input_files)}")
-    print(f"Output files: {len(output_files)}")
-    
-    # Check file contents
+    input_count = 0
     issues_found = 0
-    for input_file in input_files:
-        output_file = f"processed_{input_file}"
-        
-        if output_file not in output_files:
-            print(f"Missing output file: {output_file}")
-            issues_found += 1
-            continue
-        
-        # Compare line counts
-        input_path = os.path.join(input_dir, input_file)
-        output_path = os.path.join(output_dir, output_file)
-        
-        with open(input_path, 'r') as f_in:
-            input_lines = f_in.readlines()
-        
-        with open(output_path, 'r') as f_out:
-            output_lines = f_out.readlines()
-        
-        if len(input_lines) != len(output_lines):
-            print(f"Line count mismatch for {input_file}: Input={len(input_lines)}, Output={len(output_lines)}")
-            issues_found += 1
-            continue
-        
-        # Check content (allowing for the transformation)
-        content_mismatch = False
-        for i, (in_line, out_line) in enumerate(zip(input_lines, output_lines)):
-            if out_line != in_line.upper():
-                print(f"Content mismatch in {input_file} at line {i}")
-                content_mismatch = True
-                break
-        
-        if content_mismatch:
+    
+    def report(problem: Optional[str]) -> None:
+        nonlocal issues_found
+        if problem is not None:
+            print(problem)
             issues_found += 1
     
+    with os.scandir(input_dir) as entries:
+        names = (entry.name for entry in entries if entry.is_file())
+        if workers == 1:
+            for name in names:
+                input_count += 1
+                report(_verify_one(input_dir, output_dir, name, options))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                in_flight: Set[Future] = set()
+                for name in names:
+                    input_count += 1
+                    in_flight.add(executor.submit(_verify_one, input_dir, output_dir, name, options))
+                    if len(in_flight) >= 2 * workers:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            report(future.result())
+                for future in as_completed(in_flight):
+                    report(future.result())
+    
+    with os.scandir(output_dir) as entries:
+        output_count = sum(1 for entry in entries if entry.is_file())
+    print(f"Input files: {input_count}")
+    print(f"Output files: {output_count}")
+    
     if issues_found == 0:
         print("All files processed correctly!")
     else:
@@ -0,0 +1,59 @@
+import argparse
+import threading
+import time
+
+from sharded_counter import LockedCounter, ShardedCounter
+
+COUNTERS = {
+    "lock": LockedCounter,
+    "striped": lambda: ShardedCounter("striped"),
+    "per-thread": lambda: ShardedCounter("thread"),
+}
+
+
+def run(make_counter, num_threads, increments):
+    """Split increments across num_threads threads and time them"""
+    counter = make_counter()
+    per_thread = increments // num_threads
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker():
+        increment = counter.increment
+        barrier.wait()
+        for _ in range(per_thread):
+            increment()
+
+    threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    expected = per_thread * num_threads
+    if counter.get_count() != expected:
+        raise AssertionError(f"Expected {expected}, got {counter.get_count()}")
+    return expected / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare counter implementations under thread contention")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--increments", type=int, default=640_000, help="Total increments per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best is reported")
+    args = parser.parse_args()
+
+    print("Million increments per second")
+    print(f"{'threads':>8}" + "".join(f"{name:>12}" for name in COUNTERS))
+    for num_threads in args.threads:
+        row = f"{num_threads:>8}"
+        for make_counter in COUNTERS.values():
+            rate = max(run(make_counter, num_threads, args.increments) for _ in range(args.repeat))
+            row += f"{rate / 1e6:>12.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
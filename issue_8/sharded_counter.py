@@ -0,0 +1,199 @@
+import itertools
+import multiprocessing
+import os
+import threading
+import weakref
+from multiprocessing import shared_memory
+
+
+class LockedCounter:
+    """Counter with a single lock around every increment"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def increment(self, amount=1):
+        """Increment the counter"""
+        with self._lock:
+            self.count += amount
+
+    def get_count(self):
+        """Get the current counter value"""
+        return self.count
+
+
+class ShardedCounter:
+    """Counter split into sub-counters so threads rarely touch the same one
+
+    mode='thread' gives every thread its own sub-counter. Only the owning
+    thread writes it, so increments need no lock at all.
+
+    mode='striped' keeps a fixed number of sub-counters, each with its own
+    lock, and spreads threads across them round-robin. Memory stays bounded
+    however many threads come and go, and threads only contend when they
+    share a stripe.
+
+    get_count() adds up the sub-counters. Sub-counters only grow, so the sum
+    is never more than the true count at the moment it returns. It includes
+    every increment that finished before the call started.
+    """
+
+    def __init__(self, mode="thread", stripes=None):
+        if mode not in ("thread", "striped"):
+            raise ValueError(f"Unknown mode {mode!r}, expected 'thread' or 'striped'")
+        self.mode = mode
+        self._local = threading.local()
+        self._next_stripe = itertools.count()
+        if mode == "striped":
+            stripes = stripes or (os.cpu_count() or 1) * 4
+            self._cells = [[0] for _ in range(stripes)]
+            self._locks = [threading.Lock() for _ in range(stripes)]
+        else:
+            # Cells of finished threads are kept so their counts are not lost
+            self._cells = []
+            self._register = threading.Lock()
+
+    def _thread_cell(self):
+        """Create and remember this thread's sub-counter"""
+        cell = [0]
+        with self._register:
+            self._cells.append(cell)
+        self._local.cell = cell
+        return cell
+
+    def _stripe(self):
+        """Pick and remember this thread's stripe"""
+        index = next(self._next_stripe) % len(self._cells)
+        self._local.stripe = index
+        return index
+
+    def increment(self, amount=1):
+        """Increment the counter"""
+        if self.mode == "thread":
+            try:
+                cell = self._local.cell
+            except AttributeError:
+                cell = self._thread_cell()
+            cell[0] += amount
+        else:
+            try:
+                index = self._local.stripe
+            except AttributeError:
+                index = self._stripe()
+            with self._locks[index]:
+                self._cells[index][0] += amount
+
+    def get_count(self):
+        """Get the current counter value, summed over all sub-counters"""
+        return sum(cell[0] for cell in list(self._cells))
+
+
+class SharedMemoryCounter:
+    """Sharded counter that worker processes can share
+
+    The sub-counters are 64-bit slots in a multiprocessing.shared_memory
+    block. Each thread of each process claims a slot the first time it
+    increments and is the only writer of that slot afterwards, so increments
+    take no lock. Claiming a slot takes a multiprocessing.Lock, once per
+    thread.
+
+    Pass the counter to worker processes as an argument, e.g. through
+    Process(args=...) or a Pool initializer. Each process attaches to the
+    same block. A forked child forgets the slots its parent's threads
+    claimed, so it never writes a slot it does not own. Only the process
+    that created the counter frees the block, with unlink() or by leaving a
+    with block, once all workers are done.
+    """
+
+    SLOT_SIZE = 8
+
+    # Live counters in this process, so a forked child can reset them
+    _instances = weakref.WeakSet()
+
+    def __init__(self, slots=256, context=None):
+        """slots caps the number of threads, across all processes, that may
+        increment; context is the multiprocessing context the workers will be
+        started from, if not the default one"""
+        # Slot 0 holds the number of slots claimed so far
+        self._shm = shared_memory.SharedMemory(create=True, size=(slots + 1) * self.SLOT_SIZE)
+        self._shm.buf[:] = bytes(len(self._shm.buf))
+        self._claim_lock = (context or multiprocessing).Lock()
+        self._owner_pid = os.getpid()
+        self._attach()
+
+    def _attach(self):
+        self._values = self._shm.buf.cast("q")
+        self._local = threading.local()
+        SharedMemoryCounter._instances.add(self)
+
+    @classmethod
+    def _after_fork_in_child(cls):
+        """Drop slots inherited from the parent; the child claims its own"""
+        for counter in list(cls._instances):
+            counter._local = threading.local()
+
+    def __getstate__(self):
+        return {"name": self._shm.name, "claim_lock": self._claim_lock}
+
+    def __setstate__(self, state):
+        self._owner_pid = None
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._claim_lock = state["claim_lock"]
+        self._attach()
+
+    @property
+    def slots(self):
+        return len(self._values) - 1
+
+    def _claim_slot(self):
+        """Reserve a slot for this thread"""
+        with self._claim_lock:
+            claimed = self._values[0]
+            if claimed >= self.slots:
+                raise RuntimeError(f"All {self.slots} counter slots are in use") from None
+            self._values[0] = claimed + 1
+        slot = claimed + 1
+        self._local.slot = slot
+        return slot
+
+    def increment(self, amount=1):
+        """Increment the counter"""
+        try:
+            slot = self._local.slot
+        except AttributeError:
+            slot = self._claim_slot()
+        self._values[slot] += amount
+
+    def get_count(self):
+        """Get the current counter value, summed over all slots"""
+        return sum(self._values[1:self._values[0] + 1])
+
+    def close(self):
+        """Detach this process from the shared block"""
+        if self._values is None:
+            return
+        self._values.release()
+        self._values = None
+        self._shm.close()
+
+    def unlink(self):
+        """Free the shared block; call once, from the creating process"""
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        if self._owner_pid == os.getpid():
+            self.unlink()
+
+    def __del__(self):
+        # The cast view must be released before the block can be closed,
+        # so workers that never call close() still exit cleanly
+        if getattr(self, "_values", None) is not None:
+            self.close()
+
+
+os.register_at_fork(after_in_child=SharedMemoryCounter._after_fork_in_child)
@@ -0,0 +1,410 @@
+"""
+Benchmarks for the LRU cache implementation.
+
+Run from this directory, for example:
+
+    python cache_benchmark.py throughput --sizes 1000 10000 100000
+"""
+import argparse
+import itertools
+import random
+import threading
+import time
+import tracemalloc
+
+from concurrent_cache import ConcurrentLRUCache
+from memory_cache import LRUCache
+
+
+def _ops_per_second(ops, elapsed):
+    return ops / elapsed if elapsed > 0 else float("inf")
+
+
+def _run_hit_heavy(cache, keys):
+    start = time.perf_counter()
+    for key in keys:
+        if cache.get(key) is None:
+            cache.set(key, key)
+    return time.perf_counter() - start
+
+
+def bench_throughput(sizes, ops=200_000, hit_ratio=0.9, seed=42):
+    """
+    Measure get/set throughput of a full cache for each cache size.
+
+    The key space is sized so that roughly `hit_ratio` of the lookups hit,
+    and every miss is followed by a set that evicts the least recently used
+    entry, which is the path that used to sort the whole cache.
+    """
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        cache = LRUCache(max_size=size)
+        for i in range(size):
+            cache.set(i, i)
+
+        key_space = int(size / hit_ratio)
+        keys = [rng.randrange(key_space) for _ in range(ops)]
+
+        elapsed = _run_hit_heavy(cache, keys)
+
+        results.append({
+            "cache_size": size,
+            "ops": ops,
+            "seconds": elapsed,
+            "ops_per_sec": _ops_per_second(ops, elapsed),
+        })
+    return results
+
+
+def bench_batch(batch_sizes, keys_per_run=100_000, cache_size=100_000, seed=42):
+    """
+    Measure the per-key cost of get/set in a Python loop against
+    get_many/set_many, for each batch size.
+    """
+    rng = random.Random(seed)
+    results = []
+    for batch_size in batch_sizes:
+        cache = LRUCache(max_size=cache_size)
+        for i in range(cache_size):
+            cache.set(i, i)
+        batches = [
+            [rng.randrange(cache_size) for _ in range(batch_size)]
+            for _ in range(max(1, keys_per_run // batch_size))
+        ]
+        total_keys = len(batches) * batch_size
+
+        start = time.perf_counter()
+        for batch in batches:
+            for key in batch:
+                cache.get(key)
+        loop_get = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for batch in batches:
+            cache.get_many(batch)
+        batch_get = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for batch in batches:
+            for key in batch:
+                cache.set(key, key)
+        loop_set = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for batch in batches:
+            cache.set_many((key, key) for key in batch)
+        batch_set = time.perf_counter() - start
+
+        results.append({
+            "batch_size": batch_size,
+            "loop_get_ns_per_key": loop_get / total_keys * 1e9,
+            "get_many_ns_per_key": batch_get / total_keys * 1e9,
+            "loop_set_ns_per_key": loop_set / total_keys * 1e9,
+            "set_many_ns_per_key": batch_set / total_keys * 1e9,
+        })
+    return results
+
+
+def zipf_trace(length, key_space, exponent=1.0, seed=42):
+    """Generate a trace of keys drawn from a Zipf distribution over `key_space` keys."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank ** exponent) for rank in range(1, key_space + 1)]
+    cum_weights = list(itertools.accumulate(weights))
+    return rng.choices(range(key_space), cum_weights=cum_weights, k=length)
+
+
+def scan_trace(length, key_space, scan_length, scan_every, exponent=1.0, seed=42):
+    """
+    Generate a Zipf trace interrupted by scans: every `scan_every` requests, a
+    bulk job reads `scan_length` keys that are never requested again.
+    """
+    hot = zipf_trace(length, key_space, exponent, seed)
+    trace = []
+    scan_key = itertools.count()
+    for start in range(0, length, scan_every):
+        trace.extend(hot[start:start + scan_every])
+        trace.extend(("scan", next(scan_key)) for _ in range(scan_length))
+    return trace
+
+
+_MISSING = object()
+
+
+def bench_policies(cache_size=1_000, trace_length=200_000, key_space=50_000, policies=("lru", "tinylfu")):
+    """
+    Replay synthetic traces through each admission policy as a cache-aside
+    workload (get, then set on a miss) and report hit ratio and throughput.
+    """
+    traces = {
+        "zipf": zipf_trace(trace_length, key_space),
+        "zipf+scan": scan_trace(trace_length, key_space, scan_length=cache_size * 2, scan_every=cache_size * 10),
+    }
+    results = []
+    for trace_name, trace in traces.items():
+        for policy in policies:
+            cache = LRUCache(max_size=cache_size, policy=policy)
+            start = time.perf_counter()
+            for key in trace:
+                if cache.get(key, _MISSING) is _MISSING:
+                    cache.set(key, key)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "trace": trace_name,
+                "policy": policy,
+                "hit_ratio": cache.get_metrics()["hit_ratio"],
+                "ops_per_sec": _ops_per_second(len(trace), elapsed),
+            })
+    return results
+
+
+def bench_instrumentation(size=10_000, ops=200_000, hit_ratio=0.9, repeat=5, seed=42):
+    """
+    Compare the hit-heavy throughput with latency histograms off and on.
+
+    The configurations are run alternately `repeat` times each and the best
+    run of each is kept, so drift in machine load affects both equally.
+    """
+    rng = random.Random(seed)
+    keys = [rng.randrange(int(size / hit_ratio)) for _ in range(ops)]
+    best = {False: float("inf"), True: float("inf")}
+    for _ in range(repeat):
+        for histograms in best:
+            cache = LRUCache(max_size=size, latency_histograms=histograms)
+            for i in range(size):
+                cache.set(i, i)
+            best[histograms] = min(best[histograms], _run_hit_heavy(cache, keys))
+
+    results = [
+        {"latency_histograms": str(histograms), "ops_per_sec": _ops_per_second(ops, elapsed)}
+        for histograms, elapsed in best.items()
+    ]
+    baseline = results[0]["ops_per_sec"]
+    for row in results:
+        row["overhead_pct"] = (baseline / row["ops_per_sec"] - 1) * 100
+    return results
+
+
+def _percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))
+    return sorted_samples[index]
+
+
+def bench_expiry_latency(sizes, ops=20_000, ttl=0.05):
+    """
+    Measure per-call set() latency while a full cache of TTL entries expires.
+
+    Every entry is given the same short TTL, so all of them fall due at once;
+    the p99 and max latency show whether reclaiming them stalls a single call.
+    """
+    results = []
+    for size in sizes:
+        cache = LRUCache(max_size=size * 2)
+        for i in range(size):
+            cache.set(i, i, ttl=ttl)
+        time.sleep(ttl * 2)
+
+        samples = []
+        for i in range(ops):
+            start = time.perf_counter()
+            cache.set(("new", i), i)
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+
+        results.append({
+            "cache_size": size,
+            "p50_us": _percentile(samples, 0.50) * 1e6,
+            "p99_us": _percentile(samples, 0.99) * 1e6,
+            "max_us": samples[-1] * 1e6,
+        })
+    return results
+
+
+class _GlobalLockCache:
+    """An LRUCache behind a single lock, the baseline for the concurrent benchmark."""
+
+    def __init__(self, max_size):
+        self._cache = LRUCache(max_size=max_size)
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key, factory, ttl=None):
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                value = factory()
+                self._cache.set(key, value, ttl)
+            return value
+
+
+def bench_concurrent(thread_counts, ops_per_thread=50_000, cache_size=10_000, shards=16, seed=42):
+    """
+    Measure aggregate get_or_set throughput against the number of threads.
+
+    Compares one LRUCache behind a global lock with ConcurrentLRUCache.
+    """
+    rng = random.Random(seed)
+    keys = [rng.randrange(cache_size * 2) for _ in range(ops_per_thread)]
+    factories = {
+        "global_lock": lambda: _GlobalLockCache(cache_size),
+        "striped": lambda: ConcurrentLRUCache(max_size=cache_size, shards=shards),
+    }
+
+    results = []
+    for threads in thread_counts:
+        row = {"threads": threads}
+        for name, factory in factories.items():
+            cache = factory()
+            barrier = threading.Barrier(threads + 1)
+
+            def worker(offset):
+                barrier.wait()
+                for key in keys[offset:] + keys[:offset]:
+                    cache.get_or_set(key, lambda: key)
+
+            workers = [
+                threading.Thread(target=worker, args=(i * 997 % ops_per_thread,))
+                for i in range(threads)
+            ]
+            for t in workers:
+                t.start()
+            barrier.wait()
+            start = time.perf_counter()
+            for t in workers:
+                t.join()
+            elapsed = time.perf_counter() - start
+            row[f"{name}_ops_per_sec"] = _ops_per_second(threads * ops_per_thread, elapsed)
+        results.append(row)
+    return results
+
+
+class _LegacyCacheItem:
+    """The original CacheItem layout: a regular object with a per-instance __dict__."""
+
+    def __init__(self, key, value, ttl):
+        self.key = key
+        self.value = value
+        self.expiration = time.time() + ttl if ttl else None
+        self.access_time = time.time()
+
+
+def _legacy_layout(count, value):
+    """Build the original layout: items in a cache dict plus a references dict."""
+    cache = {}
+    references = {}
+    for key in range(count):
+        item = _LegacyCacheItem(key, value, None)
+        cache[key] = item
+        references[key] = item
+    return cache, references
+
+
+def _lru_cache_layout(count, value):
+    cache = LRUCache(max_size=count)
+    for key in range(count):
+        cache.set(key, value)
+    return cache
+
+
+def _traced_bytes(build, count, value):
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        built = build(count, value)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del built
+    return after - before
+
+
+def bench_memory(sizes):
+    """
+    Measure memory allocated per entry with tracemalloc, before and after the
+    compact CacheItem layout. Every entry shares one value object, so the
+    numbers only cover the per-entry overhead of the cache itself.
+    """
+    value = object()
+    results = []
+    for size in sizes:
+        legacy = _traced_bytes(_legacy_layout, size, value)
+        compact = _traced_bytes(_lru_cache_layout, size, value)
+        results.append({
+            "entries": size,
+            "legacy_bytes_per_entry": legacy / size,
+            "compact_bytes_per_entry": compact / size,
+        })
+    return results
+
+
+def _print_table(rows, columns):
+    print("  ".join(f"{name:>24}" for name in columns))
+    for row in rows:
+        cells = []
+        for name in columns:
+            value = row[name]
+            if isinstance(value, float):
+                cells.append(f"{value:>24.3f}" if value < 1 else f"{value:>24.1f}")
+            else:
+                cells.append(f"{value:>24}")
+        print("  ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    throughput = subparsers.add_parser("throughput", help="ops/sec against cache size")
+    throughput.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    throughput.add_argument("--ops", type=int, default=200_000)
+
+    expiry = subparsers.add_parser("expiry", help="set() latency percentiles while entries expire")
+    expiry.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    expiry.add_argument("--ops", type=int, default=20_000)
+
+    concurrent = subparsers.add_parser("concurrent", help="multi-threaded throughput against thread count")
+    concurrent.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    concurrent.add_argument("--ops", type=int, default=50_000, help="operations per thread")
+    concurrent.add_argument("--shards", type=int, default=16)
+
+    memory = subparsers.add_parser("memory", help="tracemalloc bytes per entry, legacy vs compact layout")
+    memory.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+
+    instrumentation = subparsers.add_parser("instrumentation", help="throughput cost of latency histograms")
+    instrumentation.add_argument("--size", type=int, default=10_000)
+    instrumentation.add_argument("--ops", type=int, default=200_000)
+
+    batch = subparsers.add_parser("batch", help="per-key cost of get_many/set_many against batch size")
+    batch.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 50, 100, 500])
+
+    policies = subparsers.add_parser("policies", help="hit ratio and throughput of admission policies on replayed traces")
+    policies.add_argument("--cache-size", type=int, default=1_000)
+    policies.add_argument("--length", type=int, default=200_000)
+
+    args = parser.parse_args()
+
+    if args.benchmark == "throughput":
+        rows = bench_throughput(args.sizes, ops=args.ops)
+        _print_table(rows, ["cache_size", "ops", "ops_per_sec"])
+    elif args.benchmark == "expiry":
+        rows = bench_expiry_latency(args.sizes, ops=args.ops)
+        _print_table(rows, ["cache_size", "p50_us", "p99_us", "max_us"])
+    elif args.benchmark == "concurrent":
+        rows = bench_concurrent(args.threads, ops_per_thread=args.ops, shards=args.shards)
+        _print_table(rows, ["threads", "global_lock_ops_per_sec", "striped_ops_per_sec"])
+    elif args.benchmark == "batch":
+        rows = bench_batch(args.batch_sizes)
+        _print_table(rows, ["batch_size", "loop_get_ns_per_key", "get_many_ns_per_key",
+                            "loop_set_ns_per_key", "set_many_ns_per_key"])
+    elif args.benchmark == "policies":
+        rows = bench_policies(cache_size=args.cache_size, trace_length=args.length)
+        _print_table(rows, ["trace", "policy", "hit_ratio", "ops_per_sec"])
+    elif args.benchmark == "instrumentation":
+        rows = bench_instrumentation(size=args.size, ops=args.ops)
+        _print_table(rows, ["latency_histograms", "ops_per_sec", "overhead_pct"])
+    elif args.benchmark == "memory":
+        rows = bench_memory(args.sizes)
+        _print_table(rows, ["entries", "legacy_bytes_per_entry", "compact_bytes_per_entry"])
+
+
+if __name__ == "__main__":
+    main()
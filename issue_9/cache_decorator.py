@@ -0,0 +1,121 @@
+"""
+Memoization decorator for sync functions and coroutines, backed by LRUCache.
+"""
+import asyncio
+import functools
+import inspect
+
+from memory_cache import LRUCache
+
+_MISSING = object()
+_KWARGS_MARK = object()
+
+
+def make_key(func, args, kwargs):
+    """
+    Build the default cache key for a call.
+
+    The key includes the function's module and qualified name, so several
+    functions can share one cache without their entries colliding. Like
+    functools.lru_cache, every argument must be hashable.
+    """
+    key = (func.__module__, func.__qualname__) + args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return key
+
+
+def cached(cache=None, ttl=None, key=None):
+    """
+    Memoize a function or an `async def` coroutine function in an LRU cache.
+
+    Args:
+        cache: Cache to store results in; a new LRUCache is used when omitted.
+            A ConcurrentLRUCache makes the sync wrapper safe to share between
+            threads, since misses go through its single-flight get_or_set.
+        ttl: Optional time-to-live in seconds for every cached result.
+        key: Optional callable taking the call's `*args, **kwargs` and returning
+            a hashable cache key. Defaults to `make_key`.
+
+    For coroutine functions, concurrent awaiters of the same missing key share
+    one in-flight future, so the coroutine runs once per key and not once per
+    caller. If that call raises, every waiter sees the same exception and
+    nothing is cached. If the caller running it is cancelled, the other
+    waiters are not: they retry, and one of them runs the coroutine again.
+
+    The decorated function exposes its cache as the `cache` attribute.
+    """
+    def decorator(func):
+        store = cache if cache is not None else LRUCache()
+
+        if key is None:
+            def build_key(args, kwargs):
+                return make_key(func, args, kwargs)
+        else:
+            def build_key(args, kwargs):
+                return key(*args, **kwargs)
+
+        if inspect.iscoroutinefunction(func):
+            pending = {}  # cache key -> future of the call computing it
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache_key = build_key(args, kwargs)
+                while True:
+                    value = store.get(cache_key, _MISSING)
+                    if value is not _MISSING:
+                        return value
+
+                    future = pending.get(cache_key)
+                    if future is None:
+                        break
+                    try:
+                        # Shield so a cancelled waiter does not cancel the shared call
+                        return await asyncio.shield(future)
+                    except asyncio.CancelledError:
+                        # If only the caller computing the value was cancelled,
+                        # this waiter retries and may compute it itself
+                        task = asyncio.current_task()
+                        if not future.cancelled() or (hasattr(task, "cancelling") and task.cancelling()):
+                            raise
+
+                future = asyncio.get_running_loop().create_future()
+                pending[cache_key] = future
+                try:
+                    value = await func(*args, **kwargs)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except BaseException as exc:
+                    future.set_exception(exc)
+                    # Mark the exception as retrieved in case nobody was waiting
+                    future.exception()
+                    raise
+                else:
+                    store.set(cache_key, value, ttl)
+                    future.set_result(value)
+                    return value
+                finally:
+                    del pending[cache_key]
+
+            async_wrapper.cache = store
+            return async_wrapper
+
+        get_or_set = getattr(store, "get_or_set", None)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = build_key(args, kwargs)
+            if get_or_set is not None:
+                return get_or_set(cache_key, lambda: func(*args, **kwargs), ttl)
+
+            value = store.get(cache_key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                store.set(cache_key, value, ttl)
+            return value
+
+        wrapper.cache = store
+        return wrapper
+
+    return decorator
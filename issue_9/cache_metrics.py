@@ -0,0 +1,66 @@
+"""
+Low-overhead latency histograms for cache instrumentation.
+"""
+
+
+class LatencyHistogram:
+    """
+    A histogram of latencies in nanoseconds with power-of-two buckets.
+
+    Recording is a single `bit_length()` and a list increment, so it is cheap
+    enough to sit on a cache's hot path. Percentiles are reported as the upper
+    bound of the bucket they fall in, so they are accurate to within 2x.
+    """
+    BUCKETS = 64
+
+    def __init__(self):
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns):
+        """Record one latency sample in nanoseconds."""
+        self.buckets[min(elapsed_ns.bit_length(), self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def merge(self, other):
+        """Add the samples of another histogram to this one."""
+        for index, value in enumerate(other.buckets):
+            self.buckets[index] += value
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, fraction):
+        """Return the latency in nanoseconds below which `fraction` of samples fall."""
+        if not self.count:
+            return 0
+        threshold = fraction * self.count
+        seen = 0
+        for index, value in enumerate(self.buckets):
+            seen += value
+            if seen >= threshold:
+                return min(1 << index, self.max_ns)
+        return self.max_ns
+
+    def reset(self):
+        """Discard all samples."""
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def snapshot(self):
+        """Return the sample count and latency summary in microseconds as a dict."""
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1000 if self.count else 0.0,
+            "p50_us": self.percentile(0.50) / 1000,
+            "p90_us": self.percentile(0.90) / 1000,
+            "p99_us": self.percentile(0.99) / 1000,
+            "max_us": self.max_ns / 1000,
+        }
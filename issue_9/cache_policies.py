@@ -0,0 +1,103 @@
+"""
+Admission policies for LRUCache.
+
+An admission policy sees every key the cache is asked about and decides,
+when the cache is full, whether a new key is worth evicting the least
+recently used entry for. Pure LRU always says yes, which lets a single scan
+over cold keys flush the whole hot set.
+"""
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+# Maps every 4-bit counter value to half of it, for aging a whole row at once
+_HALVE = bytes(value >> 1 for value in range(256))
+
+
+class CountMinSketch:
+    """
+    A count-min sketch of access frequencies with 4-bit saturating counters.
+
+    Each key is counted in one cell of each of four rows, and its estimate is
+    the smallest of those cells, so collisions can only overestimate. After
+    `sample_size` increments every counter is halved, so the sketch tracks
+    recent popularity rather than all-time totals.
+    """
+    MAX_COUNT = 15
+
+    def __init__(self, capacity, sample_factor=10):
+        width = 1
+        while width < max(capacity, 16):
+            width <<= 1
+        self.width = width
+        self.sample_size = max(capacity, 1) * sample_factor
+        self.additions = 0
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in range(4)]
+
+    def _indexes(self, key):
+        # Double hashing: derive every row's index from one 64-bit mixed hash
+        mixed = ((hash(key) & _MASK64) * _GOLDEN) & _MASK64
+        first = mixed >> 32
+        step = (mixed & 0xFFFFFFFF) | 1
+        mask = self._mask
+        return first & mask, (first + step) & mask, (first + 2 * step) & mask, (first + 3 * step) & mask
+
+    def increment(self, key):
+        """Count one access to `key`."""
+        i0, i1, i2, i3 = self._indexes(key)
+        r0, r1, r2, r3 = self._rows
+        limit = self.MAX_COUNT
+        if r0[i0] < limit:
+            r0[i0] += 1
+        if r1[i1] < limit:
+            r1[i1] += 1
+        if r2[i2] < limit:
+            r2[i2] += 1
+        if r3[i3] < limit:
+            r3[i3] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+
+    def estimate(self, key):
+        """Return the estimated recent access count of `key`."""
+        i0, i1, i2, i3 = self._indexes(key)
+        r0, r1, r2, r3 = self._rows
+        return min(r0[i0], r1[i1], r2[i2], r3[i3])
+
+    def _age(self):
+        self._rows = [row.translate(_HALVE) for row in self._rows]
+        self.additions //= 2
+
+
+class TinyLFUAdmission:
+    """
+    TinyLFU admission: admit a new key only if it has been looked up more often
+    recently than the entry it would evict.
+    """
+    def __init__(self, capacity):
+        self.sketch = CountMinSketch(capacity)
+
+    def record(self, key):
+        """Record a lookup of `key`, whether it hit or missed."""
+        self.sketch.increment(key)
+
+    def admit(self, candidate, victim):
+        """Return True if `candidate` should replace `victim` in a full cache."""
+        return self.sketch.estimate(candidate) > self.sketch.estimate(victim)
+
+
+POLICIES = {
+    "lru": None,
+    "tinylfu": TinyLFUAdmission,
+}
+
+
+def make_admission_policy(policy, capacity):
+    """Return the admission policy object for a policy name, or None for plain LRU."""
+    try:
+        factory = POLICIES[policy]
+    except KeyError:
+        raise ValueError(f"Unknown cache policy {policy!r}, expected one of {sorted(POLICIES)}") from None
+    return factory(capacity) if factory is not None else None
@@ -0,0 +1,209 @@
+"""
+A thread-safe LRU cache that stripes keys across independently locked shards.
+"""
+import threading
+
+from cache_metrics import LatencyHistogram
+from memory_cache import LRUCache
+
+_MISSING = object()
+
+
+class _PendingCall:
+    """An in-flight get_or_set computation that other callers can wait on."""
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = None  # Created lazily by the first waiter, under the shard lock
+        self.value = None
+        self.error = None
+
+
+def _split(total, parts, index):
+    """Return the share of `total` given to part `index` when split `parts` ways."""
+    base, extra = divmod(total, parts)
+    return base + (1 if index < extra else 0)
+
+
+class ConcurrentLRUCache:
+    """
+    A thread-safe LRU cache made of `shards` independent LRUCache instances.
+
+    Each key is routed to one shard by its hash, and every shard has its own
+    lock and its own recency order, so threads working on different shards
+    never wait for each other. `max_size` is split across the shards, which
+    means eviction is least recently used per shard rather than globally.
+
+    `max_bytes` bounds the total size of the values in all shards together,
+    so any value up to `max_bytes` can be cached whichever shard it lands
+    in. When the total goes over budget, the largest shard evicts its least
+    recently used entries until it fits. Any extra keyword arguments are
+    passed through to every shard.
+    """
+    def __init__(self, max_size=100, cleanup_interval=60, shards=16, max_bytes=None, **options):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        shards = min(shards, max(1, max_size))
+        self.max_size = max_size
+        self.cleanup_interval = cleanup_interval
+        self.max_bytes = max_bytes
+        self.shard_count = shards
+
+        self._shards = [
+            LRUCache(
+                max_size=_split(max_size, shards, i),
+                cleanup_interval=cleanup_interval,
+                # Each shard only rejects values over the whole budget; the
+                # shared total is enforced by _enforce_max_bytes
+                max_bytes=max_bytes,
+                **options,
+            )
+            for i in range(shards)
+        ]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._pending = [{} for _ in range(shards)]  # key -> _PendingCall
+
+    def _shard_index(self, key):
+        return hash(key) % self.shard_count
+
+    def get(self, key, default=None):
+        """Retrieve an item from the cache by key, or `default` if it is missing."""
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self._shards[index].get(key, default)
+
+    def set(self, key, value, ttl=None):
+        """Add or update an item in the cache with optional TTL in seconds."""
+        index = self._shard_index(key)
+        with self._locks[index]:
+            self._shards[index].set(key, value, ttl)
+        self._enforce_max_bytes()
+
+    def delete(self, key):
+        """Remove an item from the cache."""
+        index = self._shard_index(key)
+        with self._locks[index]:
+            self._shards[index].delete(key)
+
+    def get_or_set(self, key, factory, ttl=None):
+        """
+        Return the cached value for `key`, computing it with `factory()` on a miss.
+
+        Concurrent callers that miss on the same key wait for the first caller's
+        result instead of each calling `factory`. The factory runs without
+        holding the shard lock, so other keys on the shard stay available. If it
+        raises, the exception is propagated to every waiting caller and nothing
+        is cached.
+        """
+        index = self._shard_index(key)
+        shard = self._shards[index]
+        lock = self._locks[index]
+        pending = self._pending[index]
+
+        with lock:
+            value = shard.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            call = pending.get(key)
+            if call is None:
+                call = pending[key] = _PendingCall()
+                owner = True
+            else:
+                if call.event is None:
+                    call.event = threading.Event()
+                owner = False
+
+        if not owner:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            value = factory()
+        except BaseException as exc:
+            call.error = exc
+            with lock:
+                del pending[key]
+                event = call.event
+            if event is not None:
+                event.set()
+            raise
+
+        call.value = value
+        with lock:
+            shard.set(key, value, ttl)
+            del pending[key]
+            event = call.event
+        if event is not None:
+            event.set()
+        self._enforce_max_bytes()
+        return value
+
+    def _enforce_max_bytes(self):
+        """Evict from the largest shard until all shards together fit in `max_bytes`."""
+        if self.max_bytes is None:
+            return
+        # Shard totals are read without their locks; an eviction decided on a
+        # stale total is re-checked under the shard's lock before it happens
+        shards = self._shards
+        while sum(shard.total_bytes for shard in shards) > self.max_bytes:
+            index = max(range(self.shard_count), key=lambda i: shards[i].total_bytes)
+            shard = shards[index]
+            with self._locks[index]:
+                if not shard.cache:
+                    return
+                shard.delete(next(iter(shard.cache)))
+                shard.evictions += 1
+
+    def clear(self):
+        """Clear all items from the cache."""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def get_stats(self):
+        """Return statistics about the cache, summed across all shards."""
+        totals = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                stats = shard.get_stats()
+            for name, value in stats.items():
+                if value is None:
+                    totals.setdefault(name, None)
+                else:
+                    totals[name] = (totals.get(name) or 0) + value
+        totals["max_bytes"] = self.max_bytes
+        totals["shards"] = self.shard_count
+        return totals
+
+    def get_metrics(self):
+        """Return the instrumentation counters and latency summaries, merged across all shards."""
+        totals = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expirations": 0, "rejections": 0}
+        get_latency = set_latency = None
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                for name in totals:
+                    totals[name] += getattr(shard, name)
+                if shard.get_latency is not None:
+                    if get_latency is None:
+                        get_latency, set_latency = LatencyHistogram(), LatencyHistogram()
+                    get_latency.merge(shard.get_latency)
+                    set_latency.merge(shard.set_latency)
+
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_ratio"] = totals["hits"] / lookups if lookups else 0.0
+        if get_latency is not None:
+            totals["get_latency"] = get_latency.snapshot()
+            totals["set_latency"] = set_latency.snapshot()
+        return totals
+
+    def reset_metrics(self):
+        """Reset the instrumentation counters and latency histograms of every shard."""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.reset_metrics()
+
+    def __len__(self):
+        """Return the number of items in the cache."""
+        return sum(len(shard) for shard in self._shards)
@@ -1,153 +1,637 @@
 """
-A custom LRU (Least Recently Used) cache implementation with a memory leak.
+A custom LRU (Least Recently Used) cache implementation.
+
+Entries are kept in an ordered dictionary in recency order, so lookups,
+updates, deletes and evictions are all O(1). Entries with a TTL are also
+indexed in a min-heap on their expiration time, so expired entries are
+reclaimed a few at a time as they fall due instead of by scanning the
+whole cache.
+
+The cache can also be bounded by memory: with `max_bytes` set, every value is
+measured with a sizer function when it is stored and least recently used
+entries are evicted until the total is back under the budget.
+
+A cache can be written to a binary snapshot file with `snapshot(path)` and
+restored with `LRUCache.load(path)`. Loading memory-maps the file and only
+unpickles a value the first time it is read.
+
+Hits, misses, sets, evictions and expirations are always counted, and
+sampled latency histograms for `get` and `set` can be enabled; both are
+reported by `get_metrics()`.
+
+With `policy="tinylfu"`, a full cache only admits a new key if a count-min
+frequency sketch says it is more popular than the entry it would evict, which
+keeps one-off scans from flushing the hot set.
 """
 import time
-import gc
 import sys
+import heapq
+import itertools
+import mmap
+import os
+import pickle
+import struct
+from collections import OrderedDict
+
+from cache_metrics import LatencyHistogram
+from cache_policies import make_admission_policy
+
+# Snapshot layout: header, then one record per entry, least recently used first.
+# Each record is a fixed-size record header followed by the pickled key and value.
+_SNAPSHOT_MAGIC = b"LRUSNAP1"
+_SNAPSHOT_HEADER = struct.Struct("<8sQ")  # magic, entry count
+_SNAPSHOT_RECORD = struct.Struct("<IQd")  # key length, value length, remaining TTL (< 0: none)
+
+
+def deep_getsizeof(obj, _seen=None):
+    """
+    Return the size of an object in bytes, including the objects it references.
+    
+    Follows the contents of dicts, lists, tuples, sets and the attributes of
+    plain objects. Objects reachable more than once are only counted once.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)):
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_getsizeof(key, _seen) + deep_getsizeof(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for element in obj:
+            size += deep_getsizeof(element, _seen)
+    if hasattr(obj, "__dict__"):
+        size += deep_getsizeof(vars(obj), _seen)
+    return size
+
+
+def len_sizer(value):
+    """Size bytes-like values by their length and anything else with sys.getsizeof."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class _LazyValue:
+    """A pickled value inside a memory-mapped snapshot, unpickled on first use."""
+    __slots__ = ("buffer", "offset", "length")
+    
+    def __init__(self, buffer, offset, length):
+        self.buffer = buffer
+        self.offset = offset
+        self.length = length
+    
+    def raw(self):
+        """Return a zero-copy view of the pickled bytes."""
+        return memoryview(self.buffer)[self.offset:self.offset + self.length]
+    
+    def load(self):
+        """Unpickle and return the value."""
+        return pickle.loads(self.raw())
+
 
 class CacheItem:
     """Item stored in the cache with a key, value, and expiration time."""
-    def __init__(self, key, value, ttl):
+    # No per-instance __dict__: with millions of entries it dominates memory use
+    __slots__ = ("key", "value", "size", "expiration", "access_time")
+    
+    def __init__(self, key, value, ttl, size=0, now=None):
+        if now is None:
+            now = time.time()
         self.key = key
         self.value = value
-        self.expiration = time.time() + ttl if ttl else None
-        self.access_time = time.time()
+        self.size = size
+        self.expiration = now + ttl if ttl else None
+        self.access_time = now
     
-    def is_expired(self):
-        """Check if the item has expired."""
+    def is_expired(self, now=None):
+        """Check if the item has expired, optionally against a given time."""
         if self.expiration is None:
             return False
-        return time.time() > self.expiration
+        return (time.time() if now is None else now) > self.expiration
     
-    def update_access_time(self):
-        """Update the access time to the current time."""
-        self.access_time = time.time()
+    def update_access_time(self, now=None):
+        """Update the access time to the current time, or to a given time."""
+        self.access_time = time.time() if now is None else now
 
 class LRUCache:
     """
     A Least Recently Used (LRU) cache implementation with time-to-live (TTL) support.
+
+    Expired entries are removed incrementally: every `set` and `get` expires at
+    most `expire_batch_size` entries that are already due, so the cost of a call
+    does not depend on how many entries the cache holds. `cleanup_interval` is
+    kept for compatibility and only affects when `last_cleanup` is refreshed.
+
+    With `max_bytes` set, the cache is also bounded by the total size of its
+    values as measured by `sizer` (`deep_getsizeof` by default). Passing a
+    `sizer` without `max_bytes` only tracks the total for `get_stats()`. A
+    value larger than `max_bytes` on its own is not cached.
+
+    With `latency_histograms` enabled, the first `get` and `set` call after each
+    `latency_sample_interval` seconds is timed into `get_latency` and
+    `set_latency`. Sampling by time reuses the clock read each call already
+    makes, so the calls that are not sampled pay only one comparison.
+
+    `policy` selects the admission policy: "lru" (the default) admits every new
+    key, while "tinylfu" only admits a new key into a full cache if it has been
+    looked up more often recently than the least recently used entry.
+    Admission applies to the `max_size` limit; `max_bytes` evicts by LRU.
     """
-    def __init__(self, max_size=100, cleanup_interval=60):
+    def __init__(self, max_size=100, cleanup_interval=60, expire_batch_size=100,
+                 max_bytes=None, sizer=None, latency_histograms=False, latency_sample_interval=0.001,
+                 policy="lru"):
         self.max_size = max_size
         self.cleanup_interval = cleanup_interval
-        self.cache = {}  # Main cache dictionary
-        self.item_references = {}  # BUG: Keeps references to all items ever added
+        self.expire_batch_size = expire_batch_size
+        self.max_bytes = max_bytes
+        self.sizer = sizer if sizer is not None or max_bytes is None else deep_getsizeof
+        self.total_bytes = 0  # Sum of the sizes of all values in the cache
+        self.cache = OrderedDict()  # Main cache dictionary, least recently used first
         self.last_cleanup = time.time()
+        self._expiry_heap = []  # (expiration, sequence, key), may hold stale entries
+        self._expiry_sequence = itertools.count()
+        self.policy = policy
+        self.admission = make_admission_policy(policy, max_size)
+        
+        # Instrumentation counters, see get_metrics()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+        
+        # Time of the next timed get/set; never reached when histograms are off
+        self.latency_sample_interval = latency_sample_interval
+        self.get_latency = LatencyHistogram() if latency_histograms else None
+        self.set_latency = LatencyHistogram() if latency_histograms else None
+        self._next_get_sample = 0.0 if latency_histograms else float("inf")
+        self._next_set_sample = 0.0 if latency_histograms else float("inf")
+    
+    @property
+    def item_references(self):
+        """The live entries by key; kept as an alias so old callers still work."""
+        return self.cache
     
     def set(self, key, value, ttl=None):
         """Add or update an item in the cache with optional TTL in seconds."""
+        now = time.time()
+        if now >= self._next_set_sample:
+            return self._timed_call("_next_set_sample", self.set_latency, self.set, key, value, ttl)
+        
+        self.sets += 1
+        if self.admission is not None and not self._admit(key):
+            return
+        size = self.sizer(value) if self.sizer is not None else 0
+        
+        # A value over the whole budget would evict everything else and then itself
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.delete(key)
+            return
+        
         # Create cache item
-        item = CacheItem(key, value, ttl)
+        item = CacheItem(key, value, ttl, size, now)
         
-        # Store in main cache
+        # Store in main cache as the most recently used entry
+        previous = self.cache.get(key)
+        if previous is not None:
+            self.total_bytes -= previous.size
         self.cache[key] = item
+        self.total_bytes += size
+        self.cache.move_to_end(key)
         
-        # Store in references dictionary (this causes the memory leak)
-        self.item_references[key] = item
+        # Index the expiration time so the item can be reclaimed once due
+        if item.expiration is not None:
+            heapq.heappush(self._expiry_heap, (item.expiration, next(self._expiry_sequence), key))
         
         # Perform cleanup if needed
-        self._cleanup_if_needed()
+        self._cleanup_if_needed(now)
         
         # Enforce max size
         self._enforce_max_size()
     
-    def get(self, key):
-        """Retrieve an item from the cache by key."""
-        # Check if key exists
-        if key not in self.cache:
-            return None
+    def get(self, key, default=None):
+        """Retrieve an item from the cache by key, or `default` if it is missing."""
+        # The hit path reads the clock once and allocates nothing beyond that
+        now = time.time()
+        if now >= self._next_get_sample:
+            return self._timed_call("_next_get_sample", self.get_latency, self.get, key, default)
         
-        # Get the item
-        item = self.cache[key]
+        if self.admission is not None:
+            self.admission.record(key)
+        
+        # Reclaim a bounded batch of entries that are already due
+        heap = self._expiry_heap
+        if heap and heap[0][0] < now:
+            self._expire_due(now, self.expire_batch_size)
+        
+        # Get the item, if the key exists
+        item = self.cache.get(key)
+        if item is None:
+            self.misses += 1
+            return default
         
         # Check if item has expired
-        if item.is_expired():
+        expiration = item.expiration
+        if expiration is not None and now > expiration:
             self.delete(key)
-            return None
+            self.expirations += 1
+            self.misses += 1
+            return default
         
-        # Update access time and return value
-        item.update_access_time()
-        return item.value
+        # Update access time, mark as most recently used and return value
+        self.hits += 1
+        item.access_time = now
+        self.cache.move_to_end(key)
+        value = item.value
+        if type(value) is _LazyValue:
+            value = self._materialize(item)
+        return value
+    
+    def get_many(self, keys):
+        """
+        Retrieve several items at once, returning a dict of the keys that were found.
+        
+        The clock is read and due entries are expired once for the whole batch.
+        Each key found is marked as most recently used in the order given.
+        """
+        now = time.time()
+        heap = self._expiry_heap
+        if heap and heap[0][0] < now:
+            self._expire_due(now, self.expire_batch_size)
+        
+        cache = self.cache
+        move_to_end = cache.move_to_end
+        record = self.admission.record if self.admission is not None else None
+        found = {}
+        misses = 0
+        for key in keys:
+            if record is not None:
+                record(key)
+            item = cache.get(key)
+            if item is None:
+                misses += 1
+                continue
+            expiration = item.expiration
+            if expiration is not None and now > expiration:
+                self.delete(key)
+                self.expirations += 1
+                misses += 1
+                continue
+            item.access_time = now
+            move_to_end(key)
+            value = item.value
+            if type(value) is _LazyValue:
+                value = self._materialize(item)
+            found[key] = value
+        
+        self.hits += len(found)
+        self.misses += misses
+        return found
+    
+    def set_many(self, items, ttl=None):
+        """
+        Add or update several items at once from a mapping or an iterable of pairs.
+        
+        All items share the same optional TTL. Cleanup and eviction run once
+        after the whole batch is stored, so a batch larger than `max_size`
+        keeps only its last `max_size` items.
+        """
+        if hasattr(items, "items"):
+            items = items.items()
+        
+        now = time.time()
+        cache = self.cache
+        sizer = self.sizer
+        max_bytes = self.max_bytes
+        heap = self._expiry_heap
+        count = 0
+        for key, value in items:
+            count += 1
+            if self.admission is not None and not self._admit(key):
+                continue
+            size = sizer(value) if sizer is not None else 0
+            if max_bytes is not None and size > max_bytes:
+                self.delete(key)
+                continue
+            
+            item = CacheItem(key, value, ttl, size, now)
+            previous = cache.get(key)
+            if previous is not None:
+                self.total_bytes -= previous.size
+            cache[key] = item
+            self.total_bytes += size
+            cache.move_to_end(key)
+            if item.expiration is not None:
+                heapq.heappush(heap, (item.expiration, next(self._expiry_sequence), key))
+        
+        self.sets += count
+        self._cleanup_if_needed(now)
+        self._enforce_max_size()
+    
+    def delete_many(self, keys):
+        """Remove several items at once. Returns the number of items removed."""
+        before = len(self.cache)
+        for key in keys:
+            self.delete(key)
+        return before - len(self.cache)
+    
+    def _admit(self, key):
+        """
+        Return whether the admission policy lets a write of `key` into the cache.
+        
+        Only lookups count towards a key's frequency: a key that is written but
+        never read is not worth evicting anything for.
+        """
+        cache = self.cache
+        if key in cache or len(cache) < self.max_size or not cache:
+            return True
+        if self.admission.admit(key, next(iter(cache))):
+            return True
+        self.rejections += 1
+        return False
+    
+    def _timed_call(self, deadline_name, histogram, method, *args):
+        """Call `method` without sampling it again and record how long it took."""
+        setattr(self, deadline_name, float("inf"))
+        start = time.perf_counter_ns()
+        try:
+            return method(*args)
+        finally:
+            histogram.record(time.perf_counter_ns() - start)
+            setattr(self, deadline_name, time.time() + self.latency_sample_interval)
+    
+    def _materialize(self, item):
+        """Unpickle a value loaded lazily from a snapshot and store it on the item."""
+        value = item.value = item.value.load()
+        if self.sizer is not None:
+            size = self.sizer(value)
+            self.total_bytes += size - item.size
+            item.size = size
+            if self.max_bytes is not None and self.total_bytes > self.max_bytes:
+                self._enforce_max_bytes_keeping(item)
+        return value
+    
+    def _enforce_max_bytes_keeping(self, item):
+        """
+        Evict least recently used items until the cache is back under `max_bytes`,
+        without evicting `item`, which is being returned by a read.
+        
+        An unpickled value is usually larger than the pickled bytes it was
+        counted as, so a read can push a loaded cache over its budget.
+        """
+        cache = self.cache
+        while self.total_bytes > self.max_bytes and cache:
+            oldest = next(iter(cache))
+            if cache[oldest] is item:
+                break
+            self.delete(oldest)
+            self.evictions += 1
+        # Like set(), a value over the whole budget on its own is not kept
+        if item.size > self.max_bytes:
+            self.delete(item.key)
     
     def delete(self, key):
         """Remove an item from the cache."""
-        if key in self.cache:
-            del self.cache[key]
-            # BUG: We don't remove from item_references, causing a memory leak
+        item = self.cache.pop(key, None)
+        if item is not None:
+            self.total_bytes -= item.size
     
-    def _cleanup_if_needed(self):
-        """Run cleanup if the cleanup interval has elapsed."""
-        current_time = time.time()
+    def _cleanup_if_needed(self, current_time=None):
+        """Expire a bounded batch of due items and compact the expiry index."""
+        if current_time is None:
+            current_time = time.time()
+        self._expire_due(current_time, self.expire_batch_size)
         if current_time - self.last_cleanup > self.cleanup_interval:
-            self._cleanup_expired()
             self.last_cleanup = current_time
+        
+        # Overwritten and deleted items leave stale heap entries behind; rebuild
+        # the heap once they outnumber the live items so it stays proportional
+        # to the cache. The rebuild is amortized over the sets that caused it.
+        if len(self._expiry_heap) > 2 * len(self.cache) + self.expire_batch_size:
+            self._rebuild_expiry_heap()
     
     def _cleanup_expired(self):
         """Remove all expired items from the cache."""
-        expired_keys = [key for key, item in self.cache.items() if item.is_expired()]
-        for key in expired_keys:
-            self.delete(key)
+        self.last_cleanup = time.time()
+        self._expire_due(self.last_cleanup)
     
-    def _enforce_max_size(self):
-        """Remove least recently used items if cache exceeds max size."""
-        if len(self.cache) <= self.max_size:
-            return
+    def _expire_due(self, now, limit=None):
+        """
+        Remove items whose expiration time has passed, oldest deadline first.
         
-        # Sort items by access time
-        sorted_items = sorted(self.cache.items(), key=lambda x: x[1].access_time)
-        
-        # Calculate how many items to remove
-        items_to_remove = len(self.cache) - self.max_size
+        At most `limit` heap entries are examined when a limit is given, which
+        bounds the work done by a single call. Returns the number of items removed.
+        """
+        heap = self._expiry_heap
+        removed = 0
+        examined = 0
+        while heap and heap[0][0] < now:
+            if limit is not None and examined >= limit:
+                break
+            expiration, _, key = heapq.heappop(heap)
+            examined += 1
+            item = self.cache.get(key)
+            # Skip stale entries left behind by overwritten or deleted items
+            if item is not None and item.expiration == expiration:
+                self.delete(key)
+                removed += 1
+        self.expirations += removed
+        return removed
+    
+    def _rebuild_expiry_heap(self):
+        """Rebuild the expiry index from the live items only."""
+        self._expiry_heap = [
+            (item.expiration, next(self._expiry_sequence), key)
+            for key, item in self.cache.items()
+            if item.expiration is not None
+        ]
+        heapq.heapify(self._expiry_heap)
+    
+    def _enforce_max_size(self):
+        """Remove least recently used items if cache exceeds max size or max bytes."""
+        # The cache is kept in recency order, so the oldest entry is always first
+        while len(self.cache) > self.max_size:
+            self.delete(next(iter(self.cache)))
+            self.evictions += 1
         
-        # Remove oldest items
-        for i in range(items_to_remove):
-            key = sorted_items[i][0]
-            self.delete(key)
+        if self.max_bytes is not None:
+            while self.total_bytes > self.max_bytes and self.cache:
+                self.delete(next(iter(self.cache)))
+                self.evictions += 1
             
     def clear(self):
         """Clear all items from the cache."""
         self.cache.clear()
-        # BUG: We don't clear item_references
+        self._expiry_heap.clear()
+        self.total_bytes = 0
 
+    def snapshot(self, path):
+        """
+        Write the live entries to a binary snapshot file at `path`.
+        
+        Entries are written least recently used first, with their remaining TTL,
+        so `load` restores both recency order and expiry. Keys and values must be
+        picklable. The file is written next to `path` and renamed into place, so a
+        crash never leaves a partial snapshot behind. Returns the number of entries.
+        """
+        now = time.time()
+        records = []
+        for key, item in self.cache.items():
+            if item.expiration is not None:
+                remaining = item.expiration - now
+                if remaining <= 0:
+                    continue
+            else:
+                remaining = -1.0
+            records.append((key, item.value, remaining))
+        
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, len(records)))
+            for key, value, remaining in records:
+                key_data = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+                # Values that were never read since a load are copied without unpickling
+                if type(value) is _LazyValue:
+                    value_data = value.raw()
+                else:
+                    value_data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+                f.write(_SNAPSHOT_RECORD.pack(len(key_data), len(value_data), remaining))
+                f.write(key_data)
+                f.write(value_data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return len(records)
+    
+    @classmethod
+    def load(cls, path, **options):
+        """
+        Create a cache from a snapshot written by `snapshot`.
+        
+        The file is memory-mapped and only the keys are unpickled up front; each
+        value is unpickled the first time it is read with `get`. When sizes are
+        tracked, an unread value counts as the length of its pickled bytes, and
+        reading it re-measures it and evicts older entries if `max_bytes` is
+        exceeded. Keyword arguments are passed to the constructor; `max_size`
+        defaults to the number of entries in the snapshot, and if it is smaller
+        the least recently used entries are dropped. Snapshots are pickles, so
+        only load files you trust.
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, count = _SNAPSHOT_HEADER.unpack_from(buffer, 0)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not an LRUCache snapshot")
+        
+        options.setdefault("max_size", max(count, 1))
+        cache = cls(**options)
+        skip = max(0, count - cache.max_size)
+        now = time.time()
+        offset = _SNAPSHOT_HEADER.size
+        
+        for index in range(count):
+            key_length, value_length, remaining = _SNAPSHOT_RECORD.unpack_from(buffer, offset)
+            key_offset = offset + _SNAPSHOT_RECORD.size
+            value_offset = key_offset + key_length
+            offset = value_offset + value_length
+            if index < skip:
+                continue
+            
+            key = pickle.loads(memoryview(buffer)[key_offset:value_offset])
+            value = _LazyValue(buffer, value_offset, value_length)
+            size = value_length if cache.sizer is not None else 0
+            item = CacheItem(key, value, remaining if remaining >= 0 else None, size, now)
+            cache.cache[key] = item
+            cache.total_bytes += size
+            if item.expiration is not None:
+                cache._expiry_heap.append((item.expiration, next(cache._expiry_sequence), key))
+        
+        heapq.heapify(cache._expiry_heap)
+        cache._enforce_max_size()
+        return cache
+    
     def get_stats(self):
         """Return statistics about the cache."""
         return {
             "cache_size": len(self.cache),
             "references_size": len(self.item_references),
-            "memory_usage": sys.getsizeof(self.cache) + sys.getsizeof(self.item_references)
+            "memory_usage": sys.getsizeof(self.cache),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
         }
         
+    def get_metrics(self):
+        """
+        Return a snapshot of the instrumentation counters as a dict.
+        
+        Includes `get_latency` and `set_latency` summaries when latency
+        histograms are enabled.
+        """
+        lookups = self.hits + self.misses
+        metrics = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejections": self.rejections,
+        }
+        if self.get_latency is not None:
+            metrics["get_latency"] = self.get_latency.snapshot()
+            metrics["set_latency"] = self.set_latency.snapshot()
+        return metrics
+    
+    def reset_metrics(self):
+        """Reset the instrumentation counters and latency histograms."""
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+        if self.get_latency is not None:
+            self.get_latency.reset()
+            self.set_latency.reset()
+        
     def __len__(self):
         """Return the number of items in the cache."""
         return len(self.cache)
 
 
-def demonstrate_memory_leak():
-    """Function to demonstrate the memory leak in the LRU cache."""
+def demonstrate_bounded_memory():
+    """Show that the cache stays bounded as entries are evicted and expire."""
     # Create cache with small size to force evictions
     cache = LRUCache(max_size=10, cleanup_interval=1)
     
     print("Initial cache stats:")
     print(cache.get_stats())
     
-    # Add many items to force evictions
+    # Add many more items than fit, so most are evicted
     for i in range(100):
         cache.set(f"key{i}", f"value{i}", ttl=0.5)
         
-        # Sleep briefly to allow some TTLs to expire
+        # Sleep now and then so some TTLs expire while items are still being added
         if i % 20 == 0:
             time.sleep(1)
-            # Force garbage collection to show it doesn't fix the issue
-            gc.collect()
         
     # Wait for all TTLs to expire
     time.sleep(1)
     cache._cleanup_expired()
     
+    # Evicted and expired entries are gone from the only index that held them
     print("\nAfter adding 100 items and cleaning expired:")
     print(cache.get_stats())
     
-    # Add more items to demonstrate continued growth
+    # Another round leaves the cache just as empty: nothing accumulates between rounds
     for i in range(100, 200):
         cache.set(f"key{i}", f"value{i}", ttl=0.5)
     
@@ -164,4 +648,4 @@ def demonstrate_memory_leak():
     print(cache.get_stats())
 
 if __name__ == "__main__":
-    demonstrate_memory_leak()
+    demonstrate_bounded_memory()